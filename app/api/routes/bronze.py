@@ -1,48 +1,34 @@
 """Bronze layer API endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
 from app.core.auth import verify_api_key
 from app.core.models import PipelineRunRequest, PipelineRunResponse, PipelineLayer, PipelineStatus
 from app.core.pipeline_executor import get_pipeline_executor
 from app.core.job_manager import get_job_manager, JobStatus
-from app.core.rate_limiter import limiter
+from app.core.rate_limiter import limiter, DEFAULT_RATE_LIMIT, get_api_key_or_remote_address
 from datetime import datetime
+import logging
 import uuid
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/bronze", tags=["bronze"])
 
 
-@router.post("/{pipeline_name}")
-@limiter.limit("60/minute")
-async def run_bronze_pipeline(
-    request: Request,
-    pipeline_name: str,
-    force: bool = False,
-    api_key: str = Depends(verify_api_key)
-):
+async def _run_bronze_pipeline(pipeline_name: str, force: bool, job_id: str) -> None:
     """
-    Run a specific bronze layer pipeline.
+    Execute a bronze pipeline and record the outcome on its job.
+    
+    Runs as a background task after the HTTP response has been sent.
     
     Args:
         pipeline_name: Name of the bronze pipeline to run
         force: Force reprocessing of all files
-        api_key: API key for authentication
-        
-    Returns:
-        Pipeline run response with job ID and status
+        job_id: Job tracking this execution
     """
     executor = get_pipeline_executor()
     job_manager = get_job_manager()
     
     try:
-        # Create a job for this single pipeline execution
-        job_name = f"bronze.{pipeline_name}"
-        job = job_manager.create_job(job_name, total_tasks=1)
-        job_id = job.job_id
-        
-        # Update job status to running
-        job_manager.update_job_progress(job_id, status=JobStatus.RUNNING)
-        
-        # Execute pipeline
         state = await executor.execute_pipeline(
             PipelineLayer.BRONZE,
             pipeline_name,
@@ -55,21 +41,64 @@ async def run_bronze_pipeline(
         job_manager.update_job_progress(
             job_id,
             status=final_status,
+            total_tasks=1,
             completed_tasks=1 if state.status == PipelineStatus.SUCCESS else 0,
             failed_tasks=1 if state.status == PipelineStatus.FAILED else 0,
             completed_at=datetime.utcnow()
         )
+    except Exception as e:
+        logger.error(f"Bronze pipeline {pipeline_name} (job {job_id}) failed: {e}", exc_info=True)
+        job_manager.update_job_progress(
+            job_id,
+            status=JobStatus.FAILED,
+            failed_tasks=1,
+            completed_at=datetime.utcnow()
+        )
+
+
+@router.post("/{pipeline_name}", status_code=status.HTTP_202_ACCEPTED)
+@limiter.limit(DEFAULT_RATE_LIMIT, key_func=get_api_key_or_remote_address)
+async def run_bronze_pipeline(
+    request: Request,
+    pipeline_name: str,
+    background_tasks: BackgroundTasks,
+    force: bool = False,
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Start a specific bronze layer pipeline.
+    
+    The pipeline runs in the background; poll /api/jobs/{job_id} for progress.
+    
+    Args:
+        pipeline_name: Name of the bronze pipeline to run
+        force: Force reprocessing of all files
+        api_key: API key for authentication
+        
+    Returns:
+        Accepted response with the job ID to poll
+    """
+    job_manager = get_job_manager()
+    
+    try:
+        # Create a job for this single pipeline execution
+        job_name = f"bronze.{pipeline_name}"
+        job = job_manager.create_job(job_name, total_tasks=1)
+        job_id = job.job_id
+        
+        # Update job status to running
+        job_manager.update_job_progress(job_id, status=JobStatus.RUNNING)
+        
+        # Execute pipeline after the response is sent
+        background_tasks.add_task(_run_bronze_pipeline, pipeline_name, force, job_id)
         
         return {
             "job_id": job_id,
-            "run_id": state.run_id,
             "pipeline_name": pipeline_name,
             "layer": PipelineLayer.BRONZE.value,
-            "status": state.status.value,
-            "started_at": state.started_at.isoformat() if state.started_at else None,
-            "message": f"Pipeline {pipeline_name} execution completed with status: {state.status.value}"
+            "status": "accepted",
+            "message": f"Pipeline {pipeline_name} started, poll /api/jobs/{job_id} for progress"
         }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-
@@ -1,23 +1,52 @@
 """Data catalog API routes."""
+import asyncio
+import base64
+import duckdb
+import hashlib
 import logging
+import re
 import time
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel
+import orjson
+import pyarrow as pa
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import List, Literal, Optional, Dict, Any, Tuple, get_args
+from pydantic import BaseModel, Field
 
 from app.core.auth import verify_api_key
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
 from app.utils.delta_ops import DeltaOperations
-from app.utils.sql_executor import SQLExecutor
-from app.core.rate_limiter import limiter
+from app.utils.http_cache import etag_matches
+from app.utils.sql_executor_pool import get_sql_executor_pool
+from app.core.rate_limiter import (
+    limiter,
+    CATALOG_RATE_LIMIT,
+    DEFAULT_RATE_LIMIT,
+    get_api_key_or_remote_address
+)
 from app.core.pipeline_registry import get_registry
 from app.core.models import PipelineLayer
-from fastapi import Request
+from fastapi import Request, Response
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/data", tags=["data"])
 
+# Layers exposed through the data catalog (path parameters are validated against DataLayer)
+DataLayer = Literal["bronze", "silver", "gold"]
+DATA_LAYERS: Tuple[str, ...] = get_args(DataLayer)
+
+# Identifier tokens in a SQL string (bare or quoted)
+_SQL_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+# Table named by a DuckDB CatalogException
+_MISSING_TABLE = re.compile(r"Table with name (.+?) does not exist")
+
+# Statements that can be wrapped as a subquery to push a LIMIT into DuckDB
+_SELECT_STATEMENT = re.compile(r"^\s*(select|with|from|values)\b", re.IGNORECASE)
+
+# Media type of columnar /query results (Arrow IPC streaming format)
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
 
 class TableInfo(BaseModel):
     """Table information."""
@@ -71,8 +100,11 @@ class CatalogResponse(BaseModel):
 
 
 class QueryRequest(BaseModel):
-    """Request for SQL query execution."""
-    sql: str
+    """Request for SQL query execution (read-only: SELECT, SHOW and DESCRIBE only)."""
+    sql: str = Field(
+        ...,
+        description="SELECT, SHOW or DESCRIBE statements; anything else (PRAGMA, EXPLAIN, SET, CALL, DDL, DML) is rejected with 400"
+    )
     limit: int = 1000
 
 
@@ -82,6 +114,7 @@ class QueryResponse(BaseModel):
     data: List[Dict[str, Any]]
     row_count: int
     execution_time_ms: float
+    truncated: bool = False  # True when the query returned more rows than the limit
 
 
 class SilverTableInfo(BaseModel):
@@ -108,83 +141,431 @@ class SilverTableDetail(BaseModel):
     preview: List[Dict[str, Any]]
 
 
+async def _list_layer_tables(settings) -> Dict[str, Any]:
+    """
+    List Delta tables for every catalog layer concurrently.
+    
+    Returns:
+        Mapping of layer name to its list of tables, or to the exception
+        raised while listing it
+    """
+    results = await asyncio.gather(
+        *[
+            asyncio.to_thread(DeltaOperations.list_delta_tables_cached, f"{settings.delta_path}/{layer}")
+            for layer in DATA_LAYERS
+        ],
+        return_exceptions=True
+    )
+    return dict(zip(DATA_LAYERS, results))
+
+
+async def warm_caches() -> None:
+    """
+    Populate the catalog, schema and SQL executor caches ahead of user requests.
+    
+    Runs the same layer listing as get_catalog, loads the schema of every
+    registered silver table and creates the first pooled DuckDB executor.
+    Runs as a background task; failures are logged and never raised.
+    """
+    try:
+        settings = get_settings()
+        
+        pool = get_sql_executor_pool()
+        pool.release(await pool.acquire())
+        
+        layer_tables = await _list_layer_tables(settings)
+        for layer, tables in layer_tables.items():
+            if isinstance(tables, Exception):
+                logger.warning("Cache warm-up could not list tables in %s: %s", layer, tables)
+        
+        silver_names = get_registry().pipelines_by_layer(PipelineLayer.SILVER)
+        for table_name in silver_names:
+            table_path = f"{settings.delta_path}/silver/{table_name}"
+            try:
+                await asyncio.to_thread(DeltaOperations.get_table_schema_cached, table_path)
+            except Exception as e:
+                logger.warning("Cache warm-up could not load schema for silver.%s: %s", table_name, e)
+        
+        logger.info("Data caches warmed up (%s silver schemas)", len(silver_names))
+    except Exception as e:
+        logger.warning("Cache warm-up failed: %s", e, exc_info=True)
+
+
+async def _register_tables(
+    pool,
+    sql_executor,
+    catalog: Dict[str, Dict[str, Any]],
+    table_names: List[str],
+    registered_tables: List[str],
+    registration_errors: List[str]
+) -> None:
+    """
+    Register catalog tables on an executor, skipping up-to-date ones.
+    
+    Args:
+        pool: SQLExecutorPool the executor was acquired from
+        sql_executor: SQLExecutor acquired from the pool
+        catalog: Queryable tables keyed by layer_table name
+        table_names: Names to register
+        registered_tables: Appended with every name available to queries
+        registration_errors: Appended with a message for every failed registration
+    """
+    to_register = []
+    for table_name in table_names:
+        table = catalog[table_name]
+        if sql_executor.is_registered(table_name, table['version']):
+            registered_tables.append(table_name)
+        else:
+            to_register.append((table_name, table['path'], table['version']))
+    
+    # Load all stale tables in one bulk call
+    errors = await pool.run(sql_executor, sql_executor.register_delta_tables, to_register)
+    for table_name, _, _ in to_register:
+        if table_name in errors:
+            registration_errors.append(f"Failed to register {table_name}: {errors[table_name]}")
+        else:
+            registered_tables.append(table_name)
+    
+    # Stay within the executor's memory budget, keeping this query's tables
+    sql_executor.evict_tables(keep=registered_tables)
+
+
+def _referenced_tables(sql: str, table_names) -> List[str]:
+    """
+    Find which catalog tables a SQL query refers to.
+    
+    Args:
+        sql: SQL query text
+        table_names: Queryable table names (layer_table format)
+        
+    Returns:
+        Table names appearing as identifiers in the query (empty if none match)
+    """
+    tokens = {token.lower() for token in _SQL_IDENTIFIER.findall(sql)}
+    return [name for name in table_names if name.lower() in tokens]
+
+
+def _missing_catalog_table(
+    error: duckdb.CatalogException,
+    catalog: Dict[str, Dict[str, Any]],
+    registered_tables: List[str]
+) -> Optional[str]:
+    """
+    Find the unregistered catalog table a CatalogException reports as missing.
+    
+    Args:
+        error: Error raised by the query
+        catalog: Queryable tables keyed by layer_table name
+        registered_tables: Names already available to the query
+        
+    Returns:
+        Catalog table name, or None if the error is about anything else
+        (a misspelled or unknown table, a function, an already registered table)
+    """
+    match = _MISSING_TABLE.search(str(error))
+    if not match:
+        return None
+    missing = match.group(1).lower()
+    for table_name in catalog:
+        if table_name.lower() == missing and table_name not in registered_tables:
+            return table_name
+    return None
+
+
+def _strip_terminator(statement: str) -> str:
+    """
+    Cut a statement before its trailing semicolons.
+    
+    DuckDB keeps the terminator and anything after it (e.g. "; -- note") in the
+    text of the last extracted statement, which is not valid inside a subquery.
+    The tokenizer skips comments and string contents, so only real ';' tokens
+    are removed.
+    
+    Args:
+        statement: Text of one statement from extract_statements
+        
+    Returns:
+        Statement text without its terminator
+    """
+    encoded = statement.encode()
+    end = len(encoded)
+    # Token positions are byte offsets
+    for position, _ in reversed(duckdb.tokenize(statement)):
+        if encoded[position:position + 1] != b";":
+            break
+        end = position
+    return encoded[:end].decode()
+
+
+def _with_row_limit(sql: str, limit: int, statements: List[duckdb.Statement]) -> str:
+    """
+    Push a row limit into a query so DuckDB stops producing rows early.
+    
+    One extra row is requested so callers can tell whether the result was truncated.
+    Multi-statement input and statements that cannot be used as a subquery (SHOW,
+    DESCRIBE) are returned unchanged; execute_query_arrow's max_rows still caps
+    those.
+    
+    Args:
+        sql: SQL query text
+        limit: Maximum number of rows the caller will return
+        statements: Statements parsed from sql
+        
+    Returns:
+        SQL query text
+    """
+    if len(statements) != 1 or not _SELECT_STATEMENT.match(statements[0].query):
+        return sql
+    inner = _strip_terminator(statements[0].query)
+    # The closing parenthesis goes on its own line to end a trailing -- comment
+    return f"SELECT * FROM (\n{inner}\n) AS __limited LIMIT {limit + 1}"
+
+
+def _build_table_schema(schema_info: Dict[str, Any]) -> TableSchema:
+    """
+    Build a TableSchema from DeltaOperations schema information.
+    
+    The values come from the Delta log and are already well-typed, so
+    validation is skipped.
+    
+    Args:
+        schema_info: Dictionary returned by DeltaOperations.get_table_schema
+        
+    Returns:
+        TableSchema model
+    """
+    return TableSchema.model_construct(
+        fields=[
+            SchemaField.model_construct(
+                name=field["name"],
+                type=field["type"],
+                nullable=field["nullable"]
+            )
+            for field in schema_info["fields"]
+        ],
+        version=schema_info["version"],
+        row_count=schema_info["row_count"],
+        num_fields=schema_info["num_fields"]
+    )
+
+
+def _catalog_etag(*parts) -> str:
+    """
+    Build a strong ETag from the values a catalog response depends on.
+    
+    Args:
+        parts: Hashable description of the response content (e.g. sorted (name, version) tuples)
+        
+    Returns:
+        Quoted ETag value
+    """
+    return '"' + hashlib.sha256(repr(parts).encode()).hexdigest()[:16] + '"'
+
+
+def _not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Attach caching headers and short-circuit when the client already has this version.
+    
+    Args:
+        request: Incoming request (reads If-None-Match)
+        response: Response whose headers are sent with the normal body
+        etag: ETag of the current content
+        
+    Returns:
+        A 304 response if If-None-Match matches, None otherwise
+    """
+    cache_control = f"private, max-age={get_settings().catalog_cache_ttl_seconds}"
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return None
+
+
+def _arrow_ipc_stream(table: pa.Table) -> bytes:
+    """
+    Serialize a query result in the Arrow IPC streaming format.
+    
+    Args:
+        table: Query result
+        
+    Returns:
+        Arrow IPC stream bytes
+    """
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _json_compatible(table: pa.Table) -> pa.Table:
+    """
+    Cast columns that have no JSON number equivalent before row conversion.
+    
+    Decimal columns are returned as floats, as they were when results went
+    through pandas.
+    
+    Args:
+        table: Query result
+        
+    Returns:
+        Query result with decimal columns cast to float64
+    """
+    for i, field in enumerate(table.schema):
+        if pa.types.is_decimal(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.float64()))
+    return table
+
+
+def _json_default(value: Any) -> str:
+    """
+    Serialize query values orjson has no native encoding for.
+    
+    Binary (BLOB) values are base64-encoded; anything else falls back to str().
+    
+    Args:
+        value: Value orjson could not serialize
+        
+    Returns:
+        JSON string representation
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return base64.b64encode(value).decode("ascii")
+    return str(value)
+
+
+def _ndjson_rows(header: Dict[str, Any], table: pa.Table, batch_size: int = 1024):
+    """
+    Yield a query result as newline-delimited JSON.
+    
+    The first line holds the response metadata (columns, row_count...), each
+    following line is one row object.
+    
+    Args:
+        header: Metadata frame sent before the rows
+        table: Query result
+        batch_size: Number of rows converted to Python objects at a time
+    """
+    yield orjson.dumps(header) + b"\n"
+    for batch in table.to_batches(max_chunksize=batch_size):
+        yield b"".join(
+            orjson.dumps(row, default=_json_default) + b"\n" for row in batch.to_pylist()
+        )
+
+
 @router.get("/catalog", response_model=CatalogResponse)
-@limiter.limit("30/minute")
-async def get_catalog(request: Request, api_key: str = Depends(verify_api_key)):
+@limiter.limit(CATALOG_RATE_LIMIT, key_func=get_api_key_or_remote_address)
+async def get_catalog(
+    request: Request,
+    response: Response,
+    settings: Settings = Depends(get_settings),
+    api_key: str = Depends(verify_api_key)
+):
     """
     Get the complete data catalog with all schemas and tables.
     
     Scans GCS for Delta tables in bronze, silver, and gold layers.
+    Supports If-None-Match: returns 304 when no table version changed.
     """
     logger.info("Fetching data catalog")
-    settings = get_settings()
     
     try:
         schemas = {}
         
-        # Scan each layer
-        for layer in ["bronze", "silver", "gold"]:
-            layer_path = f"{settings.delta_path}/{layer}"
-            try:
-                tables = DeltaOperations.list_delta_tables(layer_path)
-                schemas[layer] = [
-                    TableInfo(
-                        name=table["name"],
-                        path=table["path"],
-                        version=table["version"]
-                    )
-                    for table in tables
-                ]
-            except Exception as e:
-                logger.warning(f"Could not list tables in {layer}: {e}")
+        # Scan all layers concurrently
+        layer_tables = await _list_layer_tables(settings)
+        
+        etag = _catalog_etag(*sorted(
+            (layer, table["name"], table["version"])
+            for layer, tables in layer_tables.items()
+            if not isinstance(tables, Exception)
+            for table in tables
+        ))
+        not_modified = _not_modified(request, response, etag)
+        if not_modified:
+            return not_modified
+        
+        for layer, tables in layer_tables.items():
+            if isinstance(tables, Exception):
+                logger.warning("Could not list tables in %s: %s", layer, tables)
                 schemas[layer] = []
+                continue
+            # Listings come from DeltaOperations, skip re-validation
+            schemas[layer] = [
+                TableInfo.model_construct(
+                    name=table["name"],
+                    path=table["path"],
+                    version=table["version"]
+                )
+                for table in tables
+            ]
         
         return CatalogResponse(schemas=schemas)
     
     except Exception as e:
-        logger.error(f"Error fetching catalog: {e}", exc_info=True)
+        logger.error("Error fetching catalog: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to fetch catalog: {str(e)}")
 
 
 @router.get("/catalog/silver", response_model=SilverCatalogResponse)
-@limiter.limit("30/minute")
-async def get_silver_catalog(request: Request, api_key: str = Depends(verify_api_key)):
+@limiter.limit(CATALOG_RATE_LIMIT, key_func=get_api_key_or_remote_address)
+async def get_silver_catalog(
+    request: Request,
+    response: Response,
+    settings: Settings = Depends(get_settings),
+    api_key: str = Depends(verify_api_key)
+):
     """
     Get catalog of silver tables with French descriptions.
     
     Returns all silver layer tables with their French descriptions, dependencies,
     and basic metadata. Uses direct table names (dim_*, fact_*).
+    Supports If-None-Match: returns 304 when no table version changed.
     """
     logger.info("Fetching silver catalog with French descriptions")
-    settings = get_settings()
     registry = get_registry()
     
     try:
         # Get all silver pipelines from registry
-        silver_pipelines = registry.list_pipelines(layer=PipelineLayer.SILVER)
+        silver_pipelines = list(registry.pipelines_by_layer(PipelineLayer.SILVER).values())
         
         # Get Delta table information from silver directory
         layer_path = f"{settings.delta_path}/silver"
         try:
-            delta_tables = {t["name"]: t for t in DeltaOperations.list_delta_tables(layer_path)}
+            listing = await asyncio.to_thread(DeltaOperations.list_delta_tables_cached, layer_path)
+            delta_tables = {t["name"]: t for t in listing}
         except Exception as e:
-            logger.warning(f"Could not list tables in silver: {e}")
+            logger.warning("Could not list tables in silver: %s", e)
             delta_tables = {}
         
+        etag = _catalog_etag(
+            sorted((name, t["version"]) for name, t in delta_tables.items()),
+            sorted(p.name for p in silver_pipelines)
+        )
+        not_modified = _not_modified(request, response, etag)
+        if not_modified:
+            return not_modified
+        
+        # Read row counts for all tables concurrently
+        # (pipeline name is now the same as the table name: dim_*, fact_*)
+        schema_results = await asyncio.gather(
+            *[
+                asyncio.to_thread(DeltaOperations.get_table_schema_cached, f"{layer_path}/{pipeline.name}")
+                for pipeline in silver_pipelines
+            ],
+            return_exceptions=True
+        )
+        
         tables = []
-        for pipeline in silver_pipelines:
-            # Pipeline name is now the same as the table name (dim_*, fact_*)
+        for pipeline, schema_info in zip(silver_pipelines, schema_results):
             table_name = pipeline.name
             delta_info = delta_tables.get(table_name, {})
             
-            # Get row count from table
             row_count = None
-            try:
-                table_path = f"{layer_path}/{table_name}"
-                schema_info = DeltaOperations.get_table_schema(table_path)
+            if isinstance(schema_info, Exception):
+                logger.warning("Could not get row count for %s: %s", table_name, schema_info)
+            else:
                 row_count = schema_info.get("row_count")
-            except Exception as e:
-                logger.warning(f"Could not get row count for {table_name}: {e}")
             
             tables.append(SilverTableInfo(
                 name=table_name,
@@ -198,15 +579,16 @@ async def get_silver_catalog(request: Request, api_key: str = Depends(verify_api
         return SilverCatalogResponse(tables=tables)
     
     except Exception as e:
-        logger.error(f"Error fetching silver catalog: {e}", exc_info=True)
+        logger.error("Error fetching silver catalog: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to fetch silver catalog: {str(e)}")
 
 
 @router.get("/catalog/silver/{table_name}", response_model=SilverTableDetail)
-@limiter.limit("30/minute")
+@limiter.limit(CATALOG_RATE_LIMIT, key_func=get_api_key_or_remote_address)
 async def get_silver_table_detail(
     request: Request,
     table_name: str,
+    settings: Settings = Depends(get_settings),
     api_key: str = Depends(verify_api_key)
 ):
     """
@@ -218,44 +600,32 @@ async def get_silver_table_detail(
     Args:
         table_name: Name of the silver table
     """
-    logger.info(f"Fetching details for silver.{table_name}")
-    settings = get_settings()
+    logger.info("Fetching details for silver.%s", table_name)
     registry = get_registry()
     
     try:
         # Get pipeline info from registry
-        silver_pipelines = registry.list_pipelines(layer=PipelineLayer.SILVER)
-        pipeline_info = next((p for p in silver_pipelines if p.name == table_name), None)
+        pipeline_info = registry.pipelines_by_layer(PipelineLayer.SILVER).get(table_name)
         
         if not pipeline_info:
             raise HTTPException(status_code=404, detail=f"Table {table_name} not found in registry")
         
         # Get table schema from silver directory
         table_path = f"{settings.delta_path}/silver/{table_name}"
-        schema_info = DeltaOperations.get_table_schema(table_path)
-        
-        table_schema = TableSchema(
-            fields=[
-                SchemaField(
-                    name=field["name"],
-                    type=field["type"],
-                    nullable=field["nullable"]
-                )
-                for field in schema_info["fields"]
-            ],
-            version=schema_info["version"],
-            row_count=schema_info["row_count"],
-            num_fields=schema_info["num_fields"]
+        # Load schema and first 10 rows concurrently
+        schema_info, preview_data = await asyncio.gather(
+            asyncio.to_thread(DeltaOperations.get_table_schema_cached, table_path),
+            asyncio.to_thread(
+                DeltaOperations.preview_table,
+                table_path=table_path,
+                limit=10,
+                filters=None,
+                sort_by=None,
+                sort_order="asc"
+            )
         )
         
-        # Get first 10 rows
-        preview_data = DeltaOperations.preview_table(
-            table_path=table_path,
-            limit=10,
-            filters=None,
-            sort_by=None,
-            sort_order="asc"
-        )
+        table_schema = _build_table_schema(schema_info)
         
         return SilverTableDetail(
             name=table_name,
@@ -268,64 +638,57 @@ async def get_silver_table_detail(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching table detail: {e}", exc_info=True)
+        logger.error("Error fetching table detail: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to fetch table detail: {str(e)}")
 
 
 @router.get("/table/{layer}/{table}", response_model=TableSchema)
-@limiter.limit("60/minute")
+@limiter.limit(DEFAULT_RATE_LIMIT, key_func=get_api_key_or_remote_address)
 async def get_table_metadata(
     request: Request,
-    layer: str,
+    response: Response,
+    layer: DataLayer,
     table: str,
+    settings: Settings = Depends(get_settings),
     api_key: str = Depends(verify_api_key)
 ):
     """
     Get metadata for a specific table including schema and row count.
     
+    Supports If-None-Match: returns 304 when the table version is unchanged.
+    
     Args:
         layer: Layer name (bronze, silver, gold)
         table: Table name
     """
-    logger.info(f"Fetching metadata for {layer}.{table}")
-    settings = get_settings()
-    
-    # Validate layer
-    if layer not in ["bronze", "silver", "gold"]:
-        raise HTTPException(status_code=400, detail="Layer must be bronze, silver, or gold")
+    logger.info("Fetching metadata for %s.%s", layer, table)
     
     # Construct table path
     table_path = f"{settings.delta_path}/{layer}/{table}"
     
     try:
-        schema_info = DeltaOperations.get_table_schema(table_path)
-        
-        return TableSchema(
-            fields=[
-                SchemaField(
-                    name=field["name"],
-                    type=field["type"],
-                    nullable=field["nullable"]
-                )
-                for field in schema_info["fields"]
-            ],
-            version=schema_info["version"],
-            row_count=schema_info["row_count"],
-            num_fields=schema_info["num_fields"]
-        )
+        schema_info = await asyncio.to_thread(DeltaOperations.get_table_schema_cached, table_path)
+        
+        etag = _catalog_etag(table_path, schema_info["version"])
+        not_modified = _not_modified(request, response, etag)
+        if not_modified:
+            return not_modified
+        
+        return _build_table_schema(schema_info)
     
     except Exception as e:
-        logger.error(f"Error fetching table metadata: {e}", exc_info=True)
+        logger.error("Error fetching table metadata: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to fetch table metadata: {str(e)}")
 
 
 @router.post("/preview/{layer}/{table}", response_model=PreviewResponse)
-@limiter.limit("60/minute")
+@limiter.limit(DEFAULT_RATE_LIMIT, key_func=get_api_key_or_remote_address)
 async def preview_table(
     request: Request,
-    layer: str,
+    layer: DataLayer,
     table: str,
     preview_req: PreviewRequest,
+    settings: Settings = Depends(get_settings),
     api_key: str = Depends(verify_api_key)
 ):
     """
@@ -336,23 +699,17 @@ async def preview_table(
         table: Table name
         preview_req: Preview request with filters and sort options
     """
-    logger.info(f"Previewing {layer}.{table} with filters={preview_req.filters}, sort={preview_req.sort_by}")
-    settings = get_settings()
-    
-    # Validate layer
-    if layer not in ["bronze", "silver", "gold"]:
-        raise HTTPException(status_code=400, detail="Layer must be bronze, silver, or gold")
+    logger.info("Previewing %s.%s with filters=%s, sort=%s", layer, table, preview_req.filters, preview_req.sort_by)
     
     # Construct table path
     table_path = f"{settings.delta_path}/{layer}/{table}"
     
     try:
-        # Convert Pydantic models to dicts
-        filters_dict = None
-        if preview_req.filters:
-            filters_dict = [f.dict() for f in preview_req.filters]
+        # Convert the filter models to dicts in a single serialization pass
+        filters_dict = preview_req.model_dump(include={"filters"})["filters"]
         
-        preview_data = DeltaOperations.preview_table(
+        preview_data = await asyncio.to_thread(
+            DeltaOperations.preview_table,
             table_path=table_path,
             limit=preview_req.limit,
             filters=filters_dict,
@@ -369,62 +726,93 @@ async def preview_table(
         )
     
     except Exception as e:
-        logger.error(f"Error previewing table: {e}", exc_info=True)
+        logger.error("Error previewing table: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to preview table: {str(e)}")
 
 
-@router.post("/query", response_model=QueryResponse)
-@limiter.limit("60/minute")
+@router.post(
+    "/query",
+    # Bodies are serialized directly (JSON, NDJSON or Arrow), not validated through a model
+    response_model=None,
+    responses={200: {"model": QueryResponse, "description": "Default `format=json` body"}}
+)
+@limiter.limit(DEFAULT_RATE_LIMIT, key_func=get_api_key_or_remote_address)
 async def execute_sql_query(
     request: Request,
     query_req: QueryRequest,
+    response_format: str = Query("json", alias="format", pattern="^(json|split|ndjson)$"),
+    settings: Settings = Depends(get_settings),
     api_key: str = Depends(verify_api_key)
 ):
     """
     Execute a SQL query against Delta tables.
     
     Tables should be referenced as layer_table_name (e.g., bronze_accueillants, silver_geo).
-    All available Delta tables are automatically registered.
+    Only read-only SELECT, SHOW and DESCRIBE statements are accepted; any other
+    statement (PRAGMA, EXPLAIN, SET, CALL, DDL, DML) is rejected with 400 before
+    anything runs.
+    Tables referenced by the query are registered automatically (all tables if none
+    can be identified). Registrations are kept on pooled executors and only
+    refreshed when a table's Delta version changes.
+    
+    The default JSON body has the QueryResponse shape: columns, data (one
+    object per row), row_count, execution_time_ms and truncated (True when the
+    query returned more rows than the limit). Binary (BLOB) values are
+    base64-encoded strings.
+    
+    With `?format=split` rows are returned as arrays of values in `columns`
+    order instead of objects, so column names are not repeated on every row.
+    
+    With `?format=ndjson` the result is streamed as newline-delimited JSON: a
+    metadata line (columns, row_count, truncated, execution_time_ms) followed
+    by one line per row.
+    
+    Clients sending `Accept: application/vnd.apache.arrow.stream` receive the
+    result as an Arrow IPC stream; row_count, truncated and execution time are
+    returned in the X-Row-Count, X-Truncated and X-Execution-Time-Ms headers.
     
     Args:
         query_req: SQL query request with query string and optional limit
+        response_format: "json" (default), "split" or "ndjson"
     """
-    logger.info(f"Executing SQL query (limit={query_req.limit})")
-    logger.debug(f"SQL: {query_req.sql}")
+    logger.debug("Executing SQL query (limit=%s)", query_req.limit)
+    logger.debug("SQL: %s", query_req.sql)
     
-    settings = get_settings()
-    sql_executor = SQLExecutor()
+    pool = get_sql_executor_pool()
+    sql_executor = await pool.acquire()
+    catalog: Dict[str, Dict[str, Any]] = {}
+    registered_tables: List[str] = []
     
     try:
         start_time = time.time()
         
-        # Register all Delta tables from all layers
-        registered_tables = []
+        # Pooled connections are shared between callers: only read-only SELECT
+        # statements may run, so no query can leave state (views, settings,
+        # attached databases) behind for the next one
+        statements = sql_executor.extract_statements(query_req.sql)
+        if not statements or any(s.type != duckdb.StatementType.SELECT for s in statements):
+            raise HTTPException(status_code=400, detail="Only SELECT queries are allowed")
+        
+        # Build the catalog of queryable tables from all layers
         registration_errors = []
         
-        for layer in ["bronze", "silver", "gold"]:
-            layer_path = f"{settings.delta_path}/{layer}"
-            try:
-                tables = DeltaOperations.list_delta_tables(layer_path)
-                logger.info(f"Found {len(tables)} tables in {layer}")
-                for table in tables:
-                    # Use underscore instead of dot for SQL compatibility
-                    table_name = f"{layer}_{table['name']}"
-                    table_path = table['path']
-                    try:
-                        sql_executor.register_delta_table(table_name, table_path)
-                        registered_tables.append(table_name)
-                        logger.info(f"Successfully registered table {table_name}")
-                    except Exception as e:
-                        error_msg = f"Failed to register {table_name}: {str(e)}"
-                        logger.error(error_msg)
-                        registration_errors.append(error_msg)
-            except Exception as e:
-                error_msg = f"Failed to list tables in {layer}: {str(e)}"
+        layer_tables = await _list_layer_tables(settings)
+        for layer, tables in layer_tables.items():
+            if isinstance(tables, Exception):
+                error_msg = f"Failed to list tables in {layer}: {str(tables)}"
                 logger.error(error_msg)
                 registration_errors.append(error_msg)
+                continue
+            logger.debug("Found %s tables in %s", len(tables), layer)
+            for table in tables:
+                # Use underscore instead of dot for SQL compatibility
+                catalog[f"{layer}_{table['name']}"] = table
+        
+        # Only register the tables the query references, fall back to all of them
+        tables_to_register = _referenced_tables(query_req.sql, catalog) or list(catalog)
+        await _register_tables(pool, sql_executor, catalog, tables_to_register, registered_tables, registration_errors)
         
-        logger.info(f"Registered {len(registered_tables)} tables: {registered_tables}")
+        logger.debug("Registered %s tables: %s", len(registered_tables), registered_tables)
         
         if not registered_tables:
             error_details = "; ".join(registration_errors) if registration_errors else "No tables found"
@@ -433,42 +821,85 @@ async def execute_sql_query(
                 detail=f"No tables could be registered. {error_details}"
             )
         
-        # Execute the query
-        result_df = sql_executor.execute_query(query_req.sql)
+        limited_sql = _with_row_limit(query_req.sql, query_req.limit, statements)
+        
+        wants_arrow = ARROW_STREAM_MEDIA_TYPE in request.headers.get("accept", "")
+        
+        # Execute the query with the limit pushed into DuckDB, keeping the result in Arrow
+        while True:
+            try:
+                table = await pool.run(sql_executor, sql_executor.execute_query_arrow, limited_sql, query_req.limit + 1)
+                break
+            except duckdb.CatalogException as e:
+                # A catalog table the SQL scan missed (e.g. a quoted name): register just
+                # that one and retry. Typos and unknown names fail without loading more tables
+                missing = _missing_catalog_table(e, catalog, registered_tables)
+                if missing is None:
+                    raise
+                logger.info("Query references unregistered table %s, registering it", missing)
+                await _register_tables(pool, sql_executor, catalog, [missing], registered_tables, registration_errors)
+                if missing not in registered_tables:
+                    raise
         
         # Apply limit
-        limited_df = result_df.head(query_req.limit)
+        truncated = table.num_rows > query_req.limit
+        table = table.slice(0, query_req.limit)
+        execution_time = (time.time() - start_time) * 1000  # ms
+        
+        logger.info(
+            "Query executed successfully, returned %s rows as %s in %.2fms",
+            table.num_rows, "arrow" if wants_arrow else response_format, execution_time
+        )
         
-        # Convert to response format
-        columns = limited_df.columns.tolist()
-        data = limited_df.to_dict('records')
+        if wants_arrow:
+            return Response(
+                content=_arrow_ipc_stream(table),
+                media_type=ARROW_STREAM_MEDIA_TYPE,
+                headers={
+                    "X-Row-Count": str(table.num_rows),
+                    "X-Truncated": str(truncated).lower(),
+                    "X-Execution-Time-Ms": f"{execution_time:.2f}"
+                }
+            )
         
-        # Convert any NaN or None to null properly
-        for row in data:
-            for key, value in row.items():
-                if value is None or (isinstance(value, float) and str(value) == 'nan'):
-                    row[key] = None
+        table = _json_compatible(table)
+        header = {
+            "columns": table.column_names,
+            "row_count": table.num_rows,
+            "execution_time_ms": round(execution_time, 2),
+            "truncated": truncated
+        }
         
-        execution_time = (time.time() - start_time) * 1000  # ms
+        if response_format == "ndjson":
+            # Stream rows without building the full payload
+            return StreamingResponse(_ndjson_rows(header, table), media_type="application/x-ndjson")
+        
+        if response_format == "split":
+            # Convert column by column, then transpose into row arrays
+            data = list(zip(*(column.to_pylist() for column in table.columns)))
+            return Response(
+                content=orjson.dumps({**header, "data": data}, default=_json_default),
+                media_type="application/json"
+            )
         
-        logger.info(f"Query executed successfully, returned {len(data)} rows in {execution_time:.2f}ms")
+        # Arrow nulls become None directly; serialize once with orjson instead of
+        # validating every row through QueryResponse
+        data = table.to_pylist()
         
-        return QueryResponse(
-            columns=columns,
-            data=data,
-            row_count=len(result_df),
-            execution_time_ms=round(execution_time, 2)
+        return Response(
+            content=orjson.dumps({**header, "data": data}, default=_json_default),
+            media_type="application/json"
         )
     
     except HTTPException:
         # Re-raise HTTP exceptions as-is
         raise
     except Exception as e:
-        logger.error(f"Error executing SQL query: {e}", exc_info=True)
+        logger.error("Error executing SQL query: %s", e, exc_info=True)
         error_msg = str(e)
         # Make error messages more user-friendly
         if "Catalog Error" in error_msg or "not found" in error_msg.lower():
-            available_tables = ", ".join(registered_tables) if registered_tables else "none"
+            available_tables = ", ".join(catalog) if catalog else "none"
             raise HTTPException(
                 status_code=400, 
                 detail=f"Table not found. Available tables: {available_tables}. Use format: layer_table_name (e.g., bronze_accueillants, silver_geo)"
@@ -478,5 +909,5 @@ async def execute_sql_query(
         else:
             raise HTTPException(status_code=500, detail=f"Query execution failed: {error_msg}")
     finally:
-        sql_executor.close()
+        pool.release(sql_executor)
 
@@ -1,8 +1,11 @@
 """Documentation endpoints."""
-from fastapi import APIRouter, Depends
-from fastapi.responses import PlainTextResponse
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import PlainTextResponse, Response
 from app.core.auth import verify_api_key
+from app.utils.http_cache import etag_matches
 from pathlib import Path
+from typing import Optional, Tuple
+import hashlib
 import os
 import logging
 
@@ -10,52 +13,74 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/docs", tags=["documentation"])
 
+# Potential DATA_MODEL.md locations, in order of preference
+# In development: /path/to/project/app/api/routes/docs.py -> /path/to/project/DATA_MODEL.md
+# In Docker: /app/app/api/routes/docs.py -> /app/DATA_MODEL.md
+_DOC_CANDIDATES = [
+    Path(__file__).parent.parent.parent.parent / "DATA_MODEL.md",  # Calculated path
+    Path("/app/DATA_MODEL.md"),  # Docker absolute path
+    Path(os.getcwd()) / "DATA_MODEL.md",  # CWD relative
+]
+
+# Resolved once at import; None if the file is not shipped with this deployment
+_DOC_PATH: Optional[Path] = next((path for path in _DOC_CANDIDATES if path.exists()), None)
+
+if _DOC_PATH:
+    logger.info(f"Serving DATA_MODEL.md from {_DOC_PATH}")
+else:
+    logger.warning(f"DATA_MODEL.md not found, tried: {', '.join(str(p) for p in _DOC_CANDIDATES)}")
+
+# Last DATA_MODEL.md read: (path, mtime, content, etag)
+_doc_cache: Optional[Tuple[str, float, bytes, str]] = None
+
+
+def _load_doc(path: Path) -> Tuple[bytes, str]:
+    """
+    Read a documentation file, reusing the cached content while its mtime is unchanged.
+    
+    Args:
+        path: Path to the documentation file
+        
+    Returns:
+        Tuple of (raw file content, quoted ETag)
+    """
+    global _doc_cache
+    mtime = path.stat().st_mtime
+    if _doc_cache and _doc_cache[0] == str(path) and _doc_cache[1] == mtime:
+        return _doc_cache[2], _doc_cache[3]
+    
+    content = path.read_bytes()
+    etag = '"' + hashlib.sha256(content).hexdigest()[:16] + '"'
+    _doc_cache = (str(path), mtime, content, etag)
+    logger.info(f"Loaded {path.name} from {path} ({len(content)} bytes)")
+    return content, etag
+
 
 @router.get("/data-model", response_class=PlainTextResponse)
-async def get_data_model_doc(api_key: str = Depends(verify_api_key)):
+async def get_data_model_doc(request: Request, api_key: str = Depends(verify_api_key)):
     """
     Get the DATA_MODEL.md documentation content.
     
     Returns the markdown content with diagrams for the data model.
+    Supports If-None-Match: returns 304 when the file is unchanged.
     """
     try:
-        # Calculate path relative to project root
-        # In development: /path/to/project/app/api/routes/docs.py -> /path/to/project/DATA_MODEL.md
-        # In Docker: /app/app/api/routes/docs.py -> /app/DATA_MODEL.md
-        project_root = Path(__file__).parent.parent.parent.parent
-        doc_path = project_root / "DATA_MODEL.md"
-        
-        logger.info(f"Looking for DATA_MODEL.md at: {doc_path}")
-        logger.info(f"__file__ is: {__file__}")
-        logger.info(f"Absolute doc_path: {doc_path.absolute()}")
-        logger.info(f"File exists: {doc_path.exists()}")
-        logger.info(f"Current working directory: {os.getcwd()}")
-        
-        # Try multiple potential locations
-        potential_paths = [
-            doc_path,  # Calculated path
-            Path("/app/DATA_MODEL.md"),  # Docker absolute path
-            Path(os.getcwd()) / "DATA_MODEL.md",  # CWD relative
-        ]
+        if _DOC_PATH is None:
+            error_msg = f"# Documentation Not Found\n\nTried paths:\n"
+            for path in _DOC_CANDIDATES:
+                error_msg += f"- {path}\n"
+            
+            logger.error(f"DATA_MODEL.md not found in any location")
+            return PlainTextResponse(
+                content=error_msg,
+                status_code=404
+            )
         
-        for path in potential_paths:
-            logger.info(f"Trying path: {path} (exists: {path.exists()})")
-            if path.exists():
-                with open(path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                    logger.info(f"Successfully loaded DATA_MODEL.md from {path} ({len(content)} characters)")
-                    return PlainTextResponse(content=content)
-        
-        # None of the paths worked
-        error_msg = f"# Documentation Not Found\n\nTried paths:\n"
-        for path in potential_paths:
-            error_msg += f"- {path} (exists: {path.exists()})\n"
-        
-        logger.error(f"DATA_MODEL.md not found in any location")
-        return PlainTextResponse(
-            content=error_msg,
-            status_code=404
-        )
+        content, etag = _load_doc(_DOC_PATH)
+        headers = {"ETag": etag, "Cache-Control": "private, max-age=300"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return PlainTextResponse(content=content, headers=headers)
     except Exception as e:
         logger.error(f"Error reading DATA_MODEL.md: {e}", exc_info=True)
         return PlainTextResponse(
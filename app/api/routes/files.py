@@ -1,21 +1,24 @@
 """File upload and management endpoints."""
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request
 from app.core.auth import verify_api_key
 from app.core.models import FileUploadResponse
-from app.core.config import get_settings
-from app.utils.gcs_ops import get_gcs_operations
-from app.core.rate_limiter import limiter
+from app.core.config import Settings, get_settings
+from app.utils.gcs_ops import GCSOperations, get_gcs_operations
+from app.core.rate_limiter import limiter, DEFAULT_RATE_LIMIT, get_api_key_or_remote_address
 from datetime import datetime
 
 router = APIRouter(prefix="/api/files", tags=["files"])
 
 
 @router.post("/upload", response_model=FileUploadResponse)
-@limiter.limit("60/minute")
+@limiter.limit(DEFAULT_RATE_LIMIT, key_func=get_api_key_or_remote_address)
 async def upload_file(
     request: Request,
     domain: str,
     file: UploadFile = File(...),
+    settings: Settings = Depends(get_settings),
+    gcs: GCSOperations = Depends(get_gcs_operations),
     api_key: str = Depends(verify_api_key)
 ):
     """
@@ -29,19 +32,18 @@ async def upload_file(
     Returns:
         File upload response with destination path
     """
-    settings = get_settings()
-    gcs = get_gcs_operations()
-    
     try:
         # Construct destination path
         destination = f"{settings.get_raw_path(domain)}/{file.filename}"
         
         # Upload file
-        gcs.upload_file(file.file, destination)
+        await asyncio.to_thread(gcs.upload_file, file.file, destination)
         
-        # Get file size
-        file.file.seek(0, 2)  # Seek to end
-        size = file.file.tell()
+        # Size is recorded while parsing the multipart body
+        size = file.size
+        if size is None:
+            file.file.seek(0, 2)  # Seek to end
+            size = file.file.tell()
         
         return FileUploadResponse(
             filename=file.filename,
@@ -55,10 +57,12 @@ async def upload_file(
 
 
 @router.get("/list")
-@limiter.limit("60/minute")
+@limiter.limit(DEFAULT_RATE_LIMIT, key_func=get_api_key_or_remote_address)
 async def list_files(
     request: Request,
     domain: str = None,
+    settings: Settings = Depends(get_settings),
+    gcs: GCSOperations = Depends(get_gcs_operations),
     api_key: str = Depends(verify_api_key)
 ):
     """
@@ -71,16 +75,13 @@ async def list_files(
     Returns:
         List of files
     """
-    settings = get_settings()
-    gcs = get_gcs_operations()
-    
     try:
         if domain:
             prefix = settings.get_raw_path(domain).replace(f"gs://{settings.gcs_bucket}/", "")
         else:
             prefix = settings.gcs_raw_prefix
         
-        files = gcs.list_files(prefix)
+        files = await asyncio.to_thread(gcs.list_files, prefix)
         
         return {
             "files": files,
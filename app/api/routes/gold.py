@@ -2,13 +2,13 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 from app.core.auth import verify_api_key
 from app.core.models import PipelineRunResponse
-from app.core.rate_limiter import limiter
+from app.core.rate_limiter import limiter, DEFAULT_RATE_LIMIT, get_api_key_or_remote_address
 
 router = APIRouter(prefix="/api/gold", tags=["gold"])
 
 
 @router.post("/{pipeline_name}", response_model=PipelineRunResponse)
-@limiter.limit("60/minute")
+@limiter.limit(DEFAULT_RATE_LIMIT, key_func=get_api_key_or_remote_address)
 async def run_gold_pipeline(
     request: Request,
     pipeline_name: str,
@@ -1,52 +1,129 @@
 """Job tracking API endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, Request
-from app.core.auth import verify_api_key
-from app.core.job_manager import get_job_manager
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from app.core.auth import verify_api_key, get_firestore_client
+from app.core.job_manager import get_async_job_manager, TASK_SUMMARY_FIELDS
 from app.core.pipeline_executor import get_pipeline_executor
-from app.core.rate_limiter import limiter
-from app.core.config import get_settings
-from typing import List, Dict, Any
+from app.core.rate_limiter import limiter, DEFAULT_RATE_LIMIT, get_api_key_or_remote_address
+from typing import List, Dict, Any, Optional
+from datetime import datetime
 from google.cloud import firestore
+from google.cloud.firestore_v1.base_query import FieldFilter
 
 router = APIRouter(prefix="/api/jobs", tags=["jobs"])
 
 
+def _log_entry(log_doc) -> Dict[str, Any]:
+    """
+    Convert a Firestore log document into a JSON-ready dict.
+    
+    The document is decoded once; the timestamp is converted to ISO format
+    and the document ID is added as `id` (used for pagination cursors).
+    
+    Args:
+        log_doc: Firestore document snapshot from a `logs` subcollection
+        
+    Returns:
+        Log entry dictionary
+    """
+    log_data = log_doc.to_dict()
+    log_data["id"] = log_doc.id
+    timestamp = log_data.get("timestamp")
+    if timestamp:
+        log_data["timestamp"] = timestamp.isoformat()
+    return log_data
+
+
+async def _fetch_log_entries(query) -> List[Dict[str, Any]]:
+    """
+    Run an async log query and convert every document.
+    
+    Args:
+        query: Async Firestore query over a `logs` subcollection
+        
+    Returns:
+        List of log entry dictionaries
+    """
+    return [_log_entry(log_doc) async for log_doc in query.stream()]
+
+
+async def _count_documents(query) -> int:
+    """
+    Count the documents matching an async query with a server-side aggregation.
+    
+    Args:
+        query: Async Firestore query (without limit/offset)
+        
+    Returns:
+        Number of matching documents
+    """
+    result = await query.count().get()
+    return result[0][0].value
+
+
 @router.get("")
-@limiter.limit("60/minute")
+@limiter.limit(DEFAULT_RATE_LIMIT, key_func=get_api_key_or_remote_address)
 async def list_jobs(
     request: Request,
     limit: int = 50,
+    after_ts: Optional[str] = None,
+    after_job_id: Optional[str] = None,
     api_key: str = Depends(verify_api_key)
 ) -> Dict[str, Any]:
     """
-    List recent jobs with progress.
+    List recent jobs with progress, newest first.
+    
+    Pass the `started_at` and `job_id` of a response's `next_cursor` as
+    `after_ts` and `after_job_id` to get the following page.
     
     Args:
         limit: Maximum number of jobs to return
+        after_ts: ISO start time of the last job already received
+        after_job_id: ID of the last job already received
         api_key: API key for authentication
         
     Returns:
-        List of jobs with progress information
+        List of jobs with progress information and `next_cursor` (None on the last page)
     """
-    job_manager = get_job_manager()
+    job_manager = get_async_job_manager()
     
     try:
-        jobs = job_manager.list_jobs(limit=limit)
+        start_after = None
+        if after_ts and after_job_id:
+            try:
+                start_after = {"started_at": datetime.fromisoformat(after_ts), "job_id": after_job_id}
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Invalid after_ts: {after_ts}")
+        
+        jobs = await job_manager.list_jobs(limit=limit, start_after=start_after)
+        
+        # A full page may be followed by more jobs
+        next_cursor = None
+        if jobs and len(jobs) == limit:
+            last_started_at = jobs[-1].get("started_at")
+            next_cursor = {
+                "started_at": last_started_at.isoformat() if last_started_at else None,
+                "job_id": jobs[-1]["job_id"]
+            }
         
         return {
             "jobs": jobs,
-            "count": len(jobs)
+            "count": len(jobs),
+            "next_cursor": next_cursor
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/{job_id}")
-@limiter.limit("60/minute")
+@limiter.limit(DEFAULT_RATE_LIMIT, key_func=get_api_key_or_remote_address)
 async def get_job(
     request: Request,
     job_id: str,
+    summary: bool = False,
     api_key: str = Depends(verify_api_key)
 ) -> Dict[str, Any]:
     """
@@ -54,15 +131,20 @@ async def get_job(
     
     Args:
         job_id: Job ID
+        summary: Omit per-task pipeline stats (fetches less data)
         api_key: API key for authentication
         
     Returns:
         Job details with task breakdown
     """
-    job_manager = get_job_manager()
+    job_manager = get_async_job_manager()
     
     try:
-        job_data = job_manager.get_job(job_id, include_tasks=True)
+        job_data = await job_manager.get_job(
+            job_id,
+            include_tasks=True,
+            task_fields=TASK_SUMMARY_FIELDS if summary else None
+        )
         
         if job_data is None:
             raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
@@ -76,72 +158,88 @@ async def get_job(
 
 
 @router.get("/{job_id}/logs")
-@limiter.limit("60/minute")
+@limiter.limit(DEFAULT_RATE_LIMIT, key_func=get_api_key_or_remote_address)
 async def get_job_logs(
     request: Request,
     job_id: str,
     task_id: str = None,
     limit: int = 1000,
-    offset: int = 0,
+    after_ts: Optional[str] = None,
+    after_doc_id: Optional[str] = None,
+    offset: int = Query(0, deprecated=True),
+    db: firestore.AsyncClient = Depends(get_firestore_client),
     api_key: str = Depends(verify_api_key)
 ) -> Dict[str, Any]:
     """
     Get logs for a specific job.
     
+    Pages are fetched with a cursor: pass the `timestamp` and `doc_id` of a
+    response's `next_cursor` as `after_ts` and `after_doc_id` to get the
+    following page. The document ID breaks ties between logs written in the
+    same instant. `offset` is deprecated since Firestore reads and bills every
+    skipped document.
+    
     Args:
         job_id: Job ID
         task_id: Optional task ID to filter logs
         limit: Maximum number of logs to return (default: 1000)
-        offset: Number of logs to skip (default: 0)
+        after_ts: ISO timestamp of the last log already received
+        after_doc_id: Document ID of the last log already received
+        offset: Number of logs to skip (deprecated, ignored when after_ts is set)
+        db: Cached async Firestore client
         api_key: API key for authentication
         
     Returns:
-        Logs for the job with metadata
+        Logs for the job with metadata: `count` logs in this page, `total` logs
+        matching the filter, and `next_cursor` (None on the last page)
     """
-    settings = get_settings()
-    db = firestore.Client(project=settings.gcp_project_id)
-    
     try:
         # Verify job exists
         job_ref = db.collection("jobs").document(job_id)
-        job_doc = job_ref.get()
+        job_doc = await job_ref.get()
         
         if not job_doc.exists:
             raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
         
-        # Build query for logs
+        # Build query for logs, filtered by task_id if provided
         logs_ref = job_ref.collection("logs")
-        query = logs_ref.order_by("timestamp")
-        
-        # Filter by task_id if provided
-        if task_id:
-            query = query.where("task_id", "==", task_id)
+        base_query = logs_ref.where(filter=FieldFilter("task_id", "==", task_id)) if task_id else logs_ref
+        query = base_query.order_by("timestamp").order_by("__name__")
         
         # Apply pagination
-        if offset > 0:
+        if after_ts:
+            try:
+                cursor = datetime.fromisoformat(after_ts)
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Invalid after_ts: {after_ts}")
+            cursor_values = {"timestamp": cursor}
+            if after_doc_id:
+                cursor_values["__name__"] = after_doc_id
+            query = query.start_after(cursor_values)
+        elif offset > 0:
             query = query.offset(offset)
         
         query = query.limit(limit)
         
-        # Fetch logs
-        logs = []
-        for log_doc in query.stream():
-            log_data = log_doc.to_dict()
-            # Convert timestamp to ISO format for JSON serialization
-            if log_data.get("timestamp"):
-                log_data["timestamp"] = log_data["timestamp"].isoformat()
-            logs.append(log_data)
+        # Fetch the page and count all matching logs concurrently
+        logs, total = await asyncio.gather(
+            _fetch_log_entries(query),
+            _count_documents(base_query)
+        )
         
-        # Get total count (approximately, without scanning all documents)
-        # For performance, we'll just return the count of fetched logs
-        total_count = len(logs)
+        # A full page may be followed by more logs
+        next_cursor = None
+        if logs and len(logs) == limit:
+            next_cursor = {"timestamp": logs[-1].get("timestamp"), "doc_id": logs[-1]["id"]}
         
         return {
             "job_id": job_id,
             "logs": logs,
-            "count": total_count,
+            "count": len(logs),
+            "total": total,
             "limit": limit,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         }
         
     except HTTPException:
@@ -151,53 +249,39 @@ async def get_job_logs(
 
 
 @router.get("/logs/stream")
-@limiter.limit("60/minute")
+@limiter.limit(DEFAULT_RATE_LIMIT, key_func=get_api_key_or_remote_address)
 async def get_all_logs_stream(
     request: Request,
     limit: int = 500,
+    db: firestore.AsyncClient = Depends(get_firestore_client),
     api_key: str = Depends(verify_api_key)
 ) -> Dict[str, Any]:
     """
     Get recent logs from all jobs in chronological order.
     
+    Uses a single collection group query over every job's `logs` subcollection,
+    ordered by timestamp on the server. Requires the collection-group scope of
+    the single-field index on `logs.timestamp` (descending) to be enabled.
+    
     Args:
         limit: Maximum number of logs to return (default: 500)
+        db: Async Firestore client
         api_key: API key for authentication
         
     Returns:
-        Combined logs from all recent jobs
+        Most recent logs across all jobs, oldest first
     """
-    settings = get_settings()
-    db = firestore.Client(project=settings.gcp_project_id)
-    
     try:
-        # Get recent jobs (last 10)
-        jobs_ref = db.collection("jobs").order_by("started_at", direction=firestore.Query.DESCENDING).limit(10)
-        
-        all_logs = []
-        
-        # Fetch logs from each job
-        for job_doc in jobs_ref.stream():
-            job_id = job_doc.id
-            logs_ref = db.collection("jobs").document(job_id).collection("logs")
-            
-            # Get logs from this job
-            for log_doc in logs_ref.order_by("timestamp").stream():
-                log_data = log_doc.to_dict()
-                # Convert timestamp to ISO format
-                if log_data.get("timestamp"):
-                    log_data["timestamp"] = log_data["timestamp"].isoformat()
-                    log_data["_timestamp_obj"] = log_doc.to_dict().get("timestamp")  # Keep for sorting
-                all_logs.append(log_data)
-        
-        # Sort all logs by timestamp
-        all_logs.sort(key=lambda x: x.get("_timestamp_obj") or "", reverse=False)
-        
-        # Remove the helper timestamp object and limit results
-        for log in all_logs:
-            log.pop("_timestamp_obj", None)
-        
-        all_logs = all_logs[-limit:]  # Keep most recent N logs
+        query = (
+            db.collection_group("logs")
+            .order_by("timestamp", direction=firestore.Query.DESCENDING)
+            .limit(limit)
+        )
+        
+        all_logs = await _fetch_log_entries(query)
+        
+        # Newest first from Firestore, return in chronological order
+        all_logs.reverse()
         
         return {
             "logs": all_logs,
@@ -209,7 +293,7 @@ async def get_all_logs_stream(
 
 
 @router.post("/{job_id}/cancel")
-@limiter.limit("60/minute")
+@limiter.limit(DEFAULT_RATE_LIMIT, key_func=get_api_key_or_remote_address)
 async def cancel_job(
     request: Request,
     job_id: str,
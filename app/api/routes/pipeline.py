@@ -1,5 +1,5 @@
 """Pipeline orchestration endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from app.core.auth import verify_api_key
 from app.core.models import (
     FullPipelineRunRequest,
@@ -11,15 +11,17 @@ from app.core.models import (
 )
 from app.core.pipeline_executor import get_pipeline_executor
 from app.core.pipeline_registry import get_registry
-from app.core.rate_limiter import limiter
+from app.core.rate_limiter import limiter, DEFAULT_RATE_LIMIT, get_api_key_or_remote_address
+from collections import Counter
 from datetime import datetime
+import orjson
 import uuid
 
 router = APIRouter(prefix="/api/pipeline", tags=["pipeline"])
 
 
 @router.post("/run")
-@limiter.limit("60/minute")
+@limiter.limit(DEFAULT_RATE_LIMIT, key_func=get_api_key_or_remote_address)
 async def run_full_pipeline(
     request: Request,
     pipeline_request: FullPipelineRunRequest = FullPipelineRunRequest(),
@@ -33,7 +35,8 @@ async def run_full_pipeline(
         user_id: User ID from API key authentication
         
     Returns:
-        Summary of pipeline execution including job ID
+        Summary of pipeline execution including job ID, serialized directly
+        with orjson (pipeline stats can hold numpy scalars and timestamps)
     """
     executor = get_pipeline_executor()
     
@@ -47,10 +50,11 @@ async def run_full_pipeline(
         
         # Summarize results
         total = len(states)
-        succeeded = sum(1 for s in states if s.status == PipelineStatus.SUCCESS)
-        failed = sum(1 for s in states if s.status == PipelineStatus.FAILED)
+        status_counts = Counter(s.status for s in states)
+        succeeded = status_counts[PipelineStatus.SUCCESS]
+        failed = status_counts[PipelineStatus.FAILED]
         
-        return {
+        summary = {
             "job_id": job_id,
             "status": "success" if failed == 0 else "partial",
             "total_pipelines": total,
@@ -58,13 +62,17 @@ async def run_full_pipeline(
             "failed": failed,
             "pipelines": [s.to_dict() for s in states]
         }
+        return Response(
+            content=orjson.dumps(summary, default=str, option=orjson.OPT_SERIALIZE_NUMPY),
+            media_type="application/json"
+        )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/status/{run_id}", response_model=PipelineStatusResponse)
-@limiter.limit("60/minute")
+@limiter.limit(DEFAULT_RATE_LIMIT, key_func=get_api_key_or_remote_address)
 async def get_pipeline_status(
     request: Request,
     run_id: str,
@@ -103,7 +111,7 @@ async def get_pipeline_status(
 
 
 @router.get("/history")
-@limiter.limit("60/minute")
+@limiter.limit(DEFAULT_RATE_LIMIT, key_func=get_api_key_or_remote_address)
 async def get_pipeline_history(
     request: Request,
     limit: int = 50,
@@ -129,7 +137,7 @@ async def get_pipeline_history(
 
 
 @router.get("/list", response_model=PipelineListResponse)
-@limiter.limit("60/minute")
+@limiter.limit(DEFAULT_RATE_LIMIT, key_func=get_api_key_or_remote_address)
 async def list_pipelines(
     request: Request,
     layer: str = None,
@@ -4,7 +4,8 @@ from app.core.auth import verify_api_key
 from app.core.models import PipelineRunResponse, PipelineLayer, PipelineStatus
 from app.core.pipeline_executor import get_pipeline_executor
 from app.core.job_manager import get_job_manager, JobStatus
-from app.core.rate_limiter import limiter
+from app.core.rate_limiter import limiter, DEFAULT_RATE_LIMIT, get_api_key_or_remote_address
+from collections import Counter
 from datetime import datetime
 import uuid
 
@@ -12,7 +13,7 @@ router = APIRouter(prefix="/api/silver", tags=["silver"])
 
 
 @router.post("/{pipeline_name}")
-@limiter.limit("60/minute")
+@limiter.limit(DEFAULT_RATE_LIMIT, key_func=get_api_key_or_remote_address)
 async def run_silver_pipeline(
     request: Request,
     pipeline_name: str,
@@ -55,8 +56,9 @@ async def run_silver_pipeline(
         job_data = job_manager.get_job(job_id)
         if job_data:
             # Count successful and failed
-            succeeded = sum(1 for s in states if s.status == PipelineStatus.SUCCESS)
-            failed = sum(1 for s in states if s.status == PipelineStatus.FAILED)
+            status_counts = Counter(s.status for s in states)
+            succeeded = status_counts[PipelineStatus.SUCCESS]
+            failed = status_counts[PipelineStatus.FAILED]
             total = len(states)
             
             # Determine final status - if any task failed, job is failed
@@ -1,9 +1,28 @@
 """API Key management utilities for generating, storing, and validating API keys."""
+import asyncio
+import logging
 import secrets
 import hashlib
+import time
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Set, Tuple
+from google.api_core.exceptions import NotFound
 from google.cloud import firestore
+from google.cloud.firestore_v1.base_query import FieldFilter
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Recently validated API keys: key hash -> (expires_at, key metadata, last_used_written_at)
+# Expired entries are kept so last_used_at writes stay throttled across cache misses.
+_VALIDATION_CACHE_MAX_SIZE = 10_000
+_validation_cache: Dict[str, Tuple[float, Dict[str, Any], float]] = {}
+
+# Minimum delay between two last_used_at writes for the same key
+LAST_USED_UPDATE_INTERVAL_SECONDS = 60
+
+# Pending last_used_at writes (keeps a reference so tasks are not garbage collected)
+_background_tasks: Set[asyncio.Task] = set()
 
 
 def generate_api_key() -> str:
@@ -22,6 +41,9 @@ def hash_api_key(api_key: str) -> str:
     """
     Hash an API key using SHA-256.
     
+    Not memoized: a cache keyed on the token would keep plaintext keys
+    (including revoked ones and any invalid token sent) in memory.
+    
     Args:
         api_key: The plaintext API key to hash
         
@@ -31,6 +53,32 @@ def hash_api_key(api_key: str) -> str:
     return hashlib.sha256(api_key.encode()).hexdigest()
 
 
+def invalidate_api_key(hashed_key: str) -> None:
+    """
+    Drop an API key from the validation cache.
+    
+    Called when a key is revoked or deleted so it stops working immediately.
+    
+    Args:
+        hashed_key: SHA-256 hash of the API key
+    """
+    _validation_cache.pop(hashed_key, None)
+
+
+async def _safe_update_last_used(doc_ref: firestore.AsyncDocumentReference) -> None:
+    """
+    Set last_used_at on an API key document, logging instead of raising on failure.
+    
+    Args:
+        doc_ref: Reference to the `api_keys/{hash}` document
+    """
+    try:
+        await doc_ref.update({"last_used_at": firestore.SERVER_TIMESTAMP})
+    except Exception as e:
+        # Don't fail validation if timestamp update fails
+        logger.warning(f"Could not update last_used_at for API key {doc_ref.id[:8]}...: {e}")
+
+
 async def create_api_key(user_id: str, db: firestore.AsyncClient) -> Dict[str, Any]:
     """
     Generate a new API key and store it in Firestore.
@@ -48,37 +96,41 @@ async def create_api_key(user_id: str, db: firestore.AsyncClient) -> Dict[str, A
             - replaced: Boolean indicating if an existing key was replaced
     """
     # Check for existing keys for this user and delete them
-    from google.cloud.firestore_v1.base_query import FieldFilter
-    
+    # Only the references are needed, so project away every field
     existing_keys = db.collection("api_keys").where(
         filter=FieldFilter("user_id", "==", user_id)
-    ).stream()
-    replaced = False
-    
-    async for doc in existing_keys:
-        await doc.reference.delete()
-        replaced = True
+    ).select([]).stream()
+    existing_refs = [doc.reference async for doc in existing_keys]
+    replaced = bool(existing_refs)
     
     # Generate the new API key
     api_key = generate_api_key()
     hashed_key = hash_api_key(api_key)
+    created_at = datetime.utcnow()
     
-    # Prepare document data
+    # Prepare document data (same creation time as the response)
     doc_data = {
         "user_id": user_id,
-        "created_at": firestore.SERVER_TIMESTAMP,
+        "created_at": created_at,
         "last_used_at": None,
         "active": True
     }
     
-    # Store in Firestore using the hash as document ID
-    doc_ref = db.collection("api_keys").document(hashed_key)
-    await doc_ref.set(doc_data)
+    # Delete the old keys and store the new one (hash as document ID) in a
+    # single atomic commit, one round-trip regardless of the number of old keys
+    batch = db.batch()
+    for ref in existing_refs:
+        batch.delete(ref)
+    batch.set(db.collection("api_keys").document(hashed_key), doc_data)
+    await batch.commit()
+    
+    for ref in existing_refs:
+        invalidate_api_key(ref.id)
     
     return {
         "api_key": api_key,  # Return plaintext only once
         "user_id": user_id,
-        "created_at": datetime.utcnow().isoformat(),
+        "created_at": created_at.isoformat(),
         "replaced": replaced
     }
 
@@ -87,6 +139,10 @@ async def validate_api_key(api_key: str, db: firestore.AsyncClient) -> Optional[
     """
     Validate an API key against Firestore.
     
+    Keys validated within the last `api_key_cache_ttl_seconds` are served from
+    an in-process cache without a Firestore read. `last_used_at` is written at
+    most once per LAST_USED_UPDATE_INTERVAL_SECONDS per key.
+    
     Args:
         api_key: The plaintext API key to validate
         db: Firestore async client
@@ -95,32 +151,51 @@ async def validate_api_key(api_key: str, db: firestore.AsyncClient) -> Optional[
         Dictionary with user_id and metadata if valid, None if invalid
     """
     hashed_key = hash_api_key(api_key)
+    now = time.monotonic()
+    
+    cached = _validation_cache.get(hashed_key)
+    if cached and cached[0] > now:
+        return cached[1]
     
     # Look up the key in Firestore
     doc_ref = db.collection("api_keys").document(hashed_key)
     doc = await doc_ref.get()
     
     if not doc.exists:
+        invalidate_api_key(hashed_key)
         return None
     
     data = doc.to_dict()
     
     # Check if the key is active
     if not data.get("active", False):
+        invalidate_api_key(hashed_key)
         return None
     
-    # Update last_used_at timestamp asynchronously (fire and forget)
-    try:
-        await doc_ref.update({"last_used_at": firestore.SERVER_TIMESTAMP})
-    except Exception:
-        # Don't fail validation if timestamp update fails
-        pass
+    # Update last_used_at in the background (fire and forget), throttled per key
+    last_used_written_at = cached[2] if cached else 0.0
+    if now - last_used_written_at >= LAST_USED_UPDATE_INTERVAL_SECONDS:
+        last_used_written_at = now
+        task = asyncio.create_task(_safe_update_last_used(doc_ref))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
     
-    return {
+    user_data = {
         "user_id": data.get("user_id"),
         "created_at": data.get("created_at"),
         "last_used_at": data.get("last_used_at")
     }
+    
+    if hashed_key not in _validation_cache and len(_validation_cache) >= _VALIDATION_CACHE_MAX_SIZE:
+        # Evict the oldest entry (dicts keep insertion order)
+        _validation_cache.pop(next(iter(_validation_cache)), None)
+    _validation_cache[hashed_key] = (
+        now + get_settings().api_key_cache_ttl_seconds,
+        user_data,
+        last_used_written_at
+    )
+    
+    return user_data
 
 
 async def revoke_api_key(api_key: str, db: firestore.AsyncClient) -> bool:
@@ -136,12 +211,14 @@ async def revoke_api_key(api_key: str, db: firestore.AsyncClient) -> bool:
     """
     hashed_key = hash_api_key(api_key)
     doc_ref = db.collection("api_keys").document(hashed_key)
-    doc = await doc_ref.get()
     
-    if not doc.exists:
+    # update() fails on a missing document, so no separate existence read
+    try:
+        await doc_ref.update({"active": False})
+    except NotFound:
         return False
     
-    await doc_ref.update({"active": False})
+    invalidate_api_key(hashed_key)
     return True
 
 
@@ -158,29 +235,42 @@ async def delete_api_key(api_key: str, db: firestore.AsyncClient) -> bool:
     """
     hashed_key = hash_api_key(api_key)
     doc_ref = db.collection("api_keys").document(hashed_key)
-    doc = await doc_ref.get()
     
-    if not doc.exists:
+    # delete() succeeds on a missing document unless it is required to exist
+    try:
+        await doc_ref.delete(option=db.write_option(exists=True))
+    except NotFound:
         return False
     
-    await doc_ref.delete()
+    invalidate_api_key(hashed_key)
     return True
 
 
-async def list_api_keys(db: firestore.AsyncClient) -> list[Dict[str, Any]]:
+async def _list_api_key_shard(
+    collection: firestore.AsyncCollectionReference,
+    start: Optional[str],
+    end: Optional[str]
+) -> List[Dict[str, Any]]:
     """
-    List all API keys (without plaintext keys).
+    List the API keys whose hash falls in [start, end).
     
     Args:
-        db: Firestore async client
+        collection: The `api_keys` collection
+        start: Lowest hash prefix in the shard, None for no lower bound
+        end: First hash prefix after the shard, None for no upper bound
         
     Returns:
-        List of dictionaries containing key metadata (no plaintext)
+        List of key metadata dictionaries
     """
-    keys = []
-    docs = db.collection("api_keys").stream()
+    # Projected to the fields we return (hash is the doc ID)
+    query = collection.select(["user_id", "created_at", "last_used_at", "active"])
+    if start is not None:
+        query = query.where(filter=FieldFilter("__name__", ">=", collection.document(start)))
+    if end is not None:
+        query = query.where(filter=FieldFilter("__name__", "<", collection.document(end)))
     
-    async for doc in docs:
+    keys = []
+    async for doc in query.stream():
         data = doc.to_dict()
         keys.append({
             "hash": doc.id,
@@ -189,6 +279,27 @@ async def list_api_keys(db: firestore.AsyncClient) -> list[Dict[str, Any]]:
             "last_used_at": data.get("last_used_at"),
             "active": data.get("active", False)
         })
-    
     return keys
 
+
+async def list_api_keys(db: firestore.AsyncClient) -> list[Dict[str, Any]]:
+    """
+    List all API keys (without plaintext keys).
+    
+    Document IDs are hex SHA-256 hashes, so the collection is split into 16
+    ranges by first hex digit and the ranges are streamed concurrently. The
+    first and last ranges are open-ended so no document can be missed.
+    
+    Args:
+        db: Firestore async client
+        
+    Returns:
+        List of dictionaries containing key metadata (no plaintext), ordered by hash
+    """
+    collection = db.collection("api_keys")
+    bounds = [None] + [f"{i:x}" for i in range(1, 16)] + [None]
+    shards = await asyncio.gather(*(
+        _list_api_key_shard(collection, start, end)
+        for start, end in zip(bounds, bounds[1:])
+    ))
+    return [key for shard in shards for key in shard]
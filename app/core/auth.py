@@ -1,8 +1,10 @@
 """API Key authentication middleware."""
+import hmac
 from fastapi import HTTPException, Security, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from google.cloud import firestore
 from app.core.api_key_manager import validate_api_key
+from app.core.config import get_settings
 from functools import lru_cache
 
 security = HTTPBearer(auto_error=False)
@@ -11,12 +13,23 @@ security = HTTPBearer(auto_error=False)
 @lru_cache()
 def get_firestore_client() -> firestore.AsyncClient:
     """Get cached Firestore async client with explicit project."""
-    from app.core.config import get_settings
     settings = get_settings()
     # Explicitly specify project to ensure proper authentication
     return firestore.AsyncClient(project=settings.gcp_project_id)
 
 
+async def warm_firestore_client() -> None:
+    """
+    Open the Firestore gRPC channel ahead of the first request.
+    
+    The Python client has no REST transport, so the channel/TLS handshake is
+    paid once at startup instead of by the first authenticated call.
+    """
+    db = get_firestore_client()
+    # Any read opens the channel; a missing document is fine
+    await db.collection("api_keys").document("_warmup").get()
+
+
 async def verify_api_key(
     credentials: HTTPAuthorizationCredentials = Security(security),
     db: firestore.AsyncClient = Depends(get_firestore_client)
@@ -42,7 +55,7 @@ async def verify_api_key(
     
     api_key = credentials.credentials
     
-    # Validate the API key against Firestore
+    # Validate the API key (recently validated keys are served from cache)
     user_data = await validate_api_key(api_key, db)
     
     if not user_data:
@@ -69,7 +82,6 @@ async def verify_admin_secret(
     Raises:
         HTTPException: If admin secret is invalid or missing
     """
-    from app.core.config import get_settings
     settings = get_settings()
     
     if not credentials:
@@ -78,7 +90,8 @@ async def verify_admin_secret(
             detail="Admin secret is missing. Please provide Authorization: Bearer header."
         )
     
-    if credentials.credentials != settings.admin_secret:
+    # Constant-time comparison; bytes so non-ASCII input cannot raise TypeError
+    if not hmac.compare_digest(credentials.credentials.encode(), settings.admin_secret.encode()):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid admin secret"
@@ -1,10 +1,13 @@
 """Configuration management using Pydantic Settings."""
 import os
 import yaml
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from pydantic_settings import BaseSettings
 from typing import Optional, List, Dict, Any
 
+# libyaml-backed loader when available (several times faster than pure Python)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class Settings(BaseSettings):
     """Application settings."""
@@ -18,6 +21,9 @@ class Settings(BaseSettings):
     # API Configuration
     admin_secret: str = "changeme"
     environment: str = "development"
+    api_key_cache_ttl_seconds: int = 60  # How long a validated API key is trusted
+    rate_limit_storage_uri: str = "memory://"  # e.g. redis://redis:6379/0 to share limits across workers
+    firestore_warmup_timeout_seconds: float = 5.0  # Startup waits at most this long for Firestore
     
     # Optional Database URL for metadata
     database_url: Optional[str] = None
@@ -25,6 +31,14 @@ class Settings(BaseSettings):
     # Application settings
     log_level: str = "INFO"
     
+    # Data catalog caching
+    catalog_cache_ttl_seconds: int = 30  # GCS table listing cache lifetime
+    # DuckDB connections for /query. Each keeps in-memory Arrow copies of the tables
+    # it registered, up to sql_executor_max_cached_mb (least recently used evicted
+    # first), so worst-case memory is pool size x that budget.
+    sql_executor_pool_size: int = 4
+    sql_executor_max_cached_mb: int = 1024
+    
     # SIAE API Configuration
     siae_api_base_url: str = "https://emplois.inclusion.beta.gouv.fr/api/v1"
     siae_api_rate_limit: int = 12  # requests per minute
@@ -38,17 +52,18 @@ class Settings(BaseSettings):
         env_file = ".env"
         case_sensitive = False
     
-    @property
+    # Derived paths are computed once; settings are not modified after creation
+    @cached_property
     def gcs_bucket_url(self) -> str:
         """Full GCS bucket URL."""
         return f"gs://{self.gcs_bucket}"
     
-    @property
+    @cached_property
     def raw_path(self) -> str:
         """Path to raw data in GCS."""
         return f"{self.gcs_bucket_url}/{self.gcs_raw_prefix}"
     
-    @property
+    @cached_property
     def delta_path(self) -> str:
         """Path to Delta tables in GCS."""
         return f"{self.gcs_bucket_url}/{self.gcs_delta_prefix}"
@@ -77,13 +92,9 @@ class Settings(BaseSettings):
         """Get path to checkpoint Delta table."""
         return f"{self.delta_path}/checkpoints"
     
-    def load_open_data_sources(self) -> List[Dict[str, Any]]:
-        """
-        Load Open Data sources from YAML configuration.
-        
-        Returns:
-            List of resource configurations with resource_id, name, and description
-        """
+    @cached_property
+    def open_data_sources_path(self) -> str:
+        """Absolute path to the Open Data sources YAML configuration."""
         config_path = self.open_data_sources_config
         
         # Handle both absolute and relative paths
@@ -91,17 +102,35 @@ class Settings(BaseSettings):
             # Try to find the file relative to the workspace root
             workspace_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
             config_path = os.path.join(workspace_root, config_path)
+        return config_path
+    
+    @cached_property
+    def open_data_sources(self) -> List[Dict[str, Any]]:
+        """Open Data sources parsed from YAML, read once per Settings instance."""
+        config_path = self.open_data_sources_path
         
         if not os.path.exists(config_path):
             return []
         
         try:
             with open(config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=_YAML_LOADER)
                 return config.get('resources', [])
         except Exception as e:
             print(f"Warning: Could not load open data sources config: {e}")
             return []
+    
+    def load_open_data_sources(self) -> List[Dict[str, Any]]:
+        """
+        Load Open Data sources from YAML configuration.
+        
+        The file only changes at deploy time, so it is parsed on the first call
+        and the same list is returned afterwards.
+        
+        Returns:
+            List of resource configurations with resource_id, name, and description
+        """
+        return self.open_data_sources
 
 
 @lru_cache()
@@ -1,36 +1,83 @@
 """Configuration loader for pipeline YAML files."""
-import yaml
+import os
+import pickle
+import struct
 import logging
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
-from importlib import import_module
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@lru_cache(maxsize=None)
+def _yaml_loader():
+    """
+    Import PyYAML on first use and pick its fastest safe loader.
+    
+    Returns:
+        yaml.CSafeLoader (libyaml) when available, otherwise yaml.SafeLoader
+    """
+    import yaml
+    
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    if loader is yaml.SafeLoader:
+        logger.warning("PyYAML was built without libyaml, pipeline configs use the pure-Python parser")
+    return loader
+
+
+@lru_cache(maxsize=None)
+def _resolve_pipeline_class(pipeline_class_path: str):
+    """
+    Import a pipeline class by its dotted path, memoized per path.
+    
+    Failed imports raise and are not cached, so they are retried on the next call.
+    
+    Args:
+        pipeline_class_path: Full path to class (e.g., "app.pipelines.bronze.geo.BronzeGeoPipeline")
+        
+    Returns:
+        The pipeline class
+    """
+    from importlib import import_module
+    
+    module_path, _, class_name = pipeline_class_path.rpartition('.')
+    return getattr(import_module(module_path), class_name)
+
+
+# Parsed-config cache files written next to each YAML file: a header of
+# (format tag, source mtime_ns, source size) followed by the pickled configs.
+# Bump the tag whenever PipelineConfig changes shape.
+_CONFIG_CACHE_SUFFIX = ".yaml.cache"
+_CONFIG_CACHE_HEADER = struct.Struct("<4sqq")
+_CONFIG_CACHE_TAG = b"PC02"
+
+
+@dataclass(slots=True, frozen=True)
 class PipelineConfig:
-    """Configuration for a single pipeline."""
+    """Configuration for a single pipeline (immutable, no per-instance __dict__)."""
     name: str
     target_table: str
     pipeline_class: str
     description: Optional[str] = None
     description_fr: Optional[str] = None
-    dependencies: Optional[List[str]] = None
+    dependencies: Tuple[str, ...] = ()
     source_path: Optional[str] = None
     
     @classmethod
     def from_dict(cls, data: dict) -> "PipelineConfig":
         """Create PipelineConfig from dictionary."""
+        get = data.get
+        # Positional, in field order
         return cls(
-            name=data["name"],
-            target_table=data["target_table"],
-            pipeline_class=data["pipeline_class"],
-            description=data.get("description"),
-            description_fr=data.get("description_fr"),
-            dependencies=data.get("dependencies", []),
-            source_path=data.get("source_path")
+            data["name"],
+            data["target_table"],
+            data["pipeline_class"],
+            get("description"),
+            get("description_fr"),
+            tuple(get("dependencies") or ()),
+            get("source_path")
         )
 
 
@@ -68,9 +115,19 @@ class ConfigLoader:
             logger.warning(f"Config file not found: {config_file}")
             return []
         
+        cached = self._read_disk_cache(config_file)
+        if cached is not None:
+            self._cache[layer] = cached
+            logger.info(f"Loaded {len(cached)} cached pipeline configs for {layer} layer")
+            return cached
+        
+        # Imported here: PyYAML is only needed when the disk cache is stale
+        import yaml
+        
         try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+            # Binary stream: the parser decodes UTF-8 itself, without a text-layer copy
+            with open(config_file, 'rb') as f:
+                data = yaml.load(f, Loader=_yaml_loader())
             
             if not data or "pipelines" not in data:
                 logger.warning(f"No pipelines found in {config_file}")
@@ -89,6 +146,7 @@ class ConfigLoader:
             
             # Cache the results
             self._cache[layer] = pipelines
+            self._write_disk_cache(config_file, pipelines)
             logger.info(f"Loaded {len(pipelines)} pipeline configs for {layer} layer")
             
             return pipelines
@@ -97,6 +155,56 @@ class ConfigLoader:
             logger.error(f"Error loading config file {config_file}: {e}", exc_info=True)
             return []
     
+    @staticmethod
+    def _cache_header(config_file: Path) -> bytes:
+        """Build the cache header identifying the current version of a YAML file."""
+        st = config_file.stat()
+        return _CONFIG_CACHE_HEADER.pack(_CONFIG_CACHE_TAG, st.st_mtime_ns, st.st_size)
+    
+    def _read_disk_cache(self, config_file: Path) -> Optional[List[PipelineConfig]]:
+        """
+        Load the parsed configs cached next to a YAML file, if still current.
+        
+        Args:
+            config_file: Path to the YAML file
+            
+        Returns:
+            Cached PipelineConfig list, or None when missing, stale or unreadable
+        """
+        cache_file = config_file.with_suffix(_CONFIG_CACHE_SUFFIX)
+        try:
+            with open(cache_file, 'rb') as f:
+                if f.read(_CONFIG_CACHE_HEADER.size) != self._cache_header(config_file):
+                    return None
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable config cache {cache_file}: {e}")
+            return None
+    
+    def _write_disk_cache(self, config_file: Path, pipelines: List[PipelineConfig]) -> None:
+        """
+        Cache parsed configs next to their YAML file (best effort).
+        
+        The file is written under a temporary name and renamed, so readers never
+        see a partial cache. Read-only config directories are skipped silently.
+        
+        Args:
+            config_file: Path to the YAML file
+            pipelines: Parsed configs to cache
+        """
+        cache_file = config_file.with_suffix(_CONFIG_CACHE_SUFFIX)
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_file, 'wb') as f:
+                f.write(self._cache_header(config_file))
+                pickle.dump(pipelines, f, protocol=5)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            logger.debug(f"Could not write config cache {cache_file}: {e}")
+            tmp_file.unlink(missing_ok=True)
+    
     def load_all_configs(self) -> Dict[str, List[PipelineConfig]]:
         """
         Load all pipeline configurations for all layers.
@@ -120,11 +228,7 @@ class ConfigLoader:
             The pipeline class
         """
         try:
-            module_path, class_name = pipeline_class_path.rsplit('.', 1)
-            module = import_module(module_path)
-            pipeline_class = getattr(module, class_name)
-            logger.debug(f"Successfully imported {pipeline_class_path}")
-            return pipeline_class
+            return _resolve_pipeline_class(pipeline_class_path)
         except Exception as e:
             logger.error(f"Error importing pipeline class {pipeline_class_path}: {e}")
             raise
@@ -139,26 +243,23 @@ class ConfigLoader:
         Returns:
             True if all dependencies are valid
         """
-        # Build a set of all available pipelines
-        available = set()
-        for layer, pipeline_list in configs.items():
-            for pipeline in pipeline_list:
-                available.add(f"{layer}.{pipeline.name}")
-        
-        # Check all dependencies
-        all_valid = True
-        for layer, pipeline_list in configs.items():
-            for pipeline in pipeline_list:
-                if pipeline.dependencies:
-                    for dep in pipeline.dependencies:
-                        if dep not in available:
-                            logger.error(
-                                f"Pipeline {layer}.{pipeline.name} depends on {dep}, "
-                                f"but {dep} is not found in configuration"
-                            )
-                            all_valid = False
-        
-        return all_valid
+        pipelines = [(layer, pipeline) for layer, pipeline_list in configs.items() for pipeline in pipeline_list]
+        available = frozenset(f"{layer}.{pipeline.name}" for layer, pipeline in pipelines)
+        
+        # Dependency edges pointing at a pipeline that is not configured
+        missing = [
+            (layer, pipeline.name, dep)
+            for layer, pipeline in pipelines
+            for dep in pipeline.dependencies or ()
+            if dep not in available
+        ]
+        for layer, name, dep in missing:
+            logger.error(
+                f"Pipeline {layer}.{name} depends on {dep}, "
+                f"but {dep} is not found in configuration"
+            )
+        
+        return not missing
     
     def clear_cache(self):
         """Clear the configuration cache."""
@@ -1,16 +1,27 @@
 """Job and Task management with Firestore persistence."""
+import asyncio
 import uuid
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from enum import Enum
 import logging
-from google.cloud import firestore
-from google.cloud.firestore_v1.base_query import FieldFilter
 
 from app.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Fields returned by list_jobs
+JOB_LIST_FIELDS = [
+    "job_id", "job_name", "status", "started_at", "completed_at", "total_tasks",
+    "completed_tasks", "failed_tasks", "progress_percent", "user_id"
+]
+
+# Task fields shown in job summaries (everything but the pipeline stats)
+TASK_SUMMARY_FIELDS = [
+    "task_id", "pipeline_name", "layer", "status", "started_at", "completed_at",
+    "duration_seconds", "message", "error"
+]
+
 
 class JobStatus(str, Enum):
     """Job execution status."""
@@ -58,13 +69,24 @@ class Task:
         self.error = error
         self.stats = stats
     
+    @property
+    def status(self) -> str:
+        """Status value, stored as the plain string written to Firestore."""
+        return self._status
+    
+    @status.setter
+    def status(self, status) -> None:
+        # Normalize once on assignment so to_dict needs no per-call conversion;
+        # TaskStatus is a str enum, so comparisons against members still hold
+        self._status = status.value if isinstance(status, TaskStatus) else status
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert task to dictionary for Firestore."""
         return {
             "task_id": self.task_id,
             "pipeline_name": self.pipeline_name,
             "layer": self.layer,
-            "status": self.status.value if isinstance(self.status, TaskStatus) else self.status,
+            "status": self._status,
             "started_at": self.started_at,
             "completed_at": self.completed_at,
             "duration_seconds": self.duration_seconds,
@@ -80,7 +102,7 @@ class Task:
             task_id=data["task_id"],
             pipeline_name=data["pipeline_name"],
             layer=data["layer"],
-            status=TaskStatus(data["status"]) if isinstance(data["status"], str) else data["status"],
+            status=data["status"],
             started_at=data.get("started_at"),
             completed_at=data.get("completed_at"),
             duration_seconds=data.get("duration_seconds"),
@@ -117,12 +139,23 @@ class Job:
         self.progress_percent = progress_percent
         self.user_id = user_id
     
+    @property
+    def status(self) -> str:
+        """Status value, stored as the plain string written to Firestore."""
+        return self._status
+    
+    @status.setter
+    def status(self, status) -> None:
+        # Normalize once on assignment so to_dict needs no per-call conversion;
+        # JobStatus is a str enum, so comparisons against members still hold
+        self._status = status.value if isinstance(status, JobStatus) else status
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert job to dictionary for Firestore."""
         return {
             "job_id": self.job_id,
             "job_name": self.job_name,
-            "status": self.status.value if isinstance(self.status, JobStatus) else self.status,
+            "status": self._status,
             "started_at": self.started_at,
             "completed_at": self.completed_at,
             "total_tasks": self.total_tasks,
@@ -138,7 +171,7 @@ class Job:
         return Job(
             job_id=data["job_id"],
             job_name=data["job_name"],
-            status=JobStatus(data["status"]) if isinstance(data["status"], str) else data["status"],
+            status=data["status"],
             started_at=data.get("started_at"),
             completed_at=data.get("completed_at"),
             total_tasks=data.get("total_tasks", 0),
@@ -149,14 +182,123 @@ class Job:
         )
 
 
-class JobManager:
+class TaskBatch:
+    """
+    Buffer task writes and commit them as Firestore write batches.
+    
+    Obtained from JobManager.batch(). Used as a context manager, pending
+    writes are committed on exit unless an exception is raised. A batch is
+    committed automatically whenever it reaches Firestore's 500-write limit.
+    """
+    
+    MAX_WRITES = 500
+    
+    def __init__(self, job_manager: "JobManager"):
+        """
+        Initialize the batch.
+        
+        Args:
+            job_manager: JobManager owning the Firestore client
+        """
+        self.job_manager = job_manager
+        self._batch = job_manager.db.batch()
+        self._pending = 0
+    
+    def add_task(self, job_id: str, task: Task) -> None:
+        """
+        Queue the creation of a task.
+        
+        Args:
+            job_id: Job ID
+            task: Task object to add
+        """
+        self._batch.set(self.job_manager._task_ref(job_id, task.task_id), task.to_dict())
+        self._queued()
+    
+    def update_task(self, job_id: str, task: Task) -> None:
+        """
+        Queue the update of an existing task.
+        
+        Args:
+            job_id: Job ID
+            task: Task object to update
+        """
+        self._batch.update(self.job_manager._task_ref(job_id, task.task_id), task.to_dict())
+        self._queued()
+    
+    def _queued(self) -> None:
+        """Count a queued write, committing when the batch is full."""
+        self._pending += 1
+        if self._pending >= self.MAX_WRITES:
+            self.commit()
+    
+    def commit(self) -> None:
+        """Commit all queued writes in one request."""
+        if self._pending:
+            self._batch.commit()
+            logger.debug(f"Committed {self._pending} task writes")
+            self._batch = self.job_manager.db.batch()
+            self._pending = 0
+    
+    def __enter__(self) -> "TaskBatch":
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.commit()
+        return False
+
+
+class _JobStore:
+    """Firestore references and queries shared by the sync and async job managers."""
+    
+    jobs_collection = "jobs"
+    
+    def _task_ref(self, job_id: str, task_id: str):
+        """Get the Firestore document reference of a task."""
+        return (
+            self.db.collection(self.jobs_collection)
+            .document(job_id)
+            .collection("tasks")
+            .document(task_id)
+        )
+    
+    def _jobs_query(self, limit: int, start_after: Optional[Dict[str, Any]]):
+        """Build the newest-first, projected job listing query."""
+        query = (
+            self.db.collection(self.jobs_collection)
+            .select(JOB_LIST_FIELDS)
+            .order_by("started_at", direction=self._fs.Query.DESCENDING)
+            .order_by("__name__", direction=self._fs.Query.DESCENDING)
+        )
+        if start_after is not None:
+            query = query.start_after({
+                "started_at": start_after["started_at"],
+                "__name__": start_after["job_id"]
+            })
+        return query.limit(limit)
+    
+    def _tasks_query(self, job_id: str):
+        """Build the query listing a job's tasks in start order."""
+        return (
+            self.db.collection(self.jobs_collection)
+            .document(job_id)
+            .collection("tasks")
+            .order_by("started_at")
+        )
+
+
+class JobManager(_JobStore):
     """Manages jobs and tasks with Firestore persistence."""
     
     def __init__(self):
         """Initialize JobManager with Firestore client."""
+        # Imported here: loading grpc/protobuf is slow and only needed once a manager exists
+        from google.cloud import firestore
+        
         settings = get_settings()
+        self._fs = firestore
         self.db = firestore.Client(project=settings.gcp_project_id)
-        self.jobs_collection = "jobs"
     
     def create_job(self, job_name: str, total_tasks: int = 0, user_id: Optional[str] = None) -> Job:
         """
@@ -218,13 +360,14 @@ class JobManager:
             completed_tasks: Number of completed tasks (optional)
             failed_tasks: Number of failed tasks (optional)
             completed_at: Completion timestamp (optional)
+        
+        The job document is only read when completed_tasks is given without
+        total_tasks (progress needs the stored total); pass both to update
+        progress in a single write.
         """
-        job_ref = self.db.collection(self.jobs_collection).document(job_id)
-        job_data = job_ref.get().to_dict()
+        from google.api_core.exceptions import NotFound
         
-        if job_data is None:
-            logger.error(f"Job {job_id} not found")
-            return
+        job_ref = self.db.collection(self.jobs_collection).document(job_id)
         
         updates = {}
         
@@ -237,8 +380,14 @@ class JobManager:
         if completed_tasks is not None:
             updates["completed_tasks"] = completed_tasks
             # Calculate progress
-            # Use updated total_tasks if provided, otherwise use existing
-            total = total_tasks if total_tasks is not None else job_data.get("total_tasks", 0)
+            # Use updated total_tasks if provided, otherwise read the stored one
+            total = total_tasks
+            if total is None:
+                job_data = job_ref.get().to_dict()
+                if job_data is None:
+                    logger.error(f"Job {job_id} not found")
+                    return
+                total = job_data.get("total_tasks", 0)
             if total > 0:
                 updates["progress_percent"] = (completed_tasks / total) * 100
         
@@ -249,9 +398,38 @@ class JobManager:
             updates["completed_at"] = completed_at
         
         if updates:
-            job_ref.update(updates)
+            try:
+                job_ref.update(updates)
+            except NotFound:
+                logger.error(f"Job {job_id} not found")
+                return
             logger.debug(f"Updated job {job_id} progress: {updates}")
     
+    def update_tasks_bulk(self, job_id: str, tasks: List[Task]) -> None:
+        """
+        Update several tasks of a job in one batched write.
+        
+        Args:
+            job_id: Job ID
+            tasks: Task objects to update
+        """
+        with self.batch() as batch:
+            for task in tasks:
+                batch.update_task(job_id, task)
+        logger.debug(f"Updated {len(tasks)} tasks in job {job_id}")
+    
+    def batch(self) -> TaskBatch:
+        """
+        Start a batch of task writes.
+        
+        Use `with job_manager.batch() as batch:` and call batch.add_task /
+        batch.update_task to write many tasks in one round-trip.
+        
+        Returns:
+            New TaskBatch
+        """
+        return TaskBatch(self)
+    
     def add_task(self, job_id: str, task: Task) -> None:
         """
         Add a task to a job.
@@ -260,13 +438,7 @@ class JobManager:
             job_id: Job ID
             task: Task object to add
         """
-        task_ref = (
-            self.db.collection(self.jobs_collection)
-            .document(job_id)
-            .collection("tasks")
-            .document(task.task_id)
-        )
-        task_ref.set(task.to_dict())
+        self._task_ref(job_id, task.task_id).set(task.to_dict())
         logger.debug(f"Added task {task.task_id} to job {job_id}")
     
     def update_task(self, job_id: str, task: Task) -> None:
@@ -277,22 +449,22 @@ class JobManager:
             job_id: Job ID
             task: Task object to update
         """
-        task_ref = (
-            self.db.collection(self.jobs_collection)
-            .document(job_id)
-            .collection("tasks")
-            .document(task.task_id)
-        )
-        task_ref.update(task.to_dict())
+        self._task_ref(job_id, task.task_id).update(task.to_dict())
         logger.debug(f"Updated task {task.task_id} in job {job_id}")
     
-    def get_job(self, job_id: str, include_tasks: bool = False) -> Optional[Dict[str, Any]]:
+    def get_job(
+        self,
+        job_id: str,
+        include_tasks: bool = False,
+        task_fields: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Get a job by ID.
         
         Args:
             job_id: Job ID
             include_tasks: Whether to include tasks in the response
+            task_fields: Task fields to fetch (e.g. TASK_SUMMARY_FIELDS), all when None
             
         Returns:
             Job dictionary with optional tasks list, or None if not found
@@ -308,6 +480,8 @@ class JobManager:
         if include_tasks:
             # Fetch all tasks for this job
             tasks_ref = job_ref.collection("tasks")
+            if task_fields is not None:
+                tasks_ref = tasks_ref.select(task_fields)
             tasks = []
             for task_doc in tasks_ref.stream():
                 tasks.append(task_doc.to_dict())
@@ -318,24 +492,24 @@ class JobManager:
         
         return job_data
     
-    def list_jobs(self, limit: int = 50) -> List[Dict[str, Any]]:
+    def list_jobs(
+        self,
+        limit: int = 50,
+        start_after: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
         """
-        List recent jobs.
+        List recent jobs, newest first, projected to JOB_LIST_FIELDS.
         
         Args:
             limit: Maximum number of jobs to return
+            start_after: Cursor from the last job of the previous page, as
+                {"started_at": datetime, "job_id": str}
             
         Returns:
             List of job dictionaries
         """
-        jobs_ref = (
-            self.db.collection(self.jobs_collection)
-            .order_by("started_at", direction=firestore.Query.DESCENDING)
-            .limit(limit)
-        )
-        
         jobs = []
-        for job_doc in jobs_ref.stream():
+        for job_doc in self._jobs_query(limit, start_after).stream():
             jobs.append(job_doc.to_dict())
         
         return jobs
@@ -350,22 +524,134 @@ class JobManager:
         Returns:
             List of task dictionaries
         """
-        tasks_ref = (
-            self.db.collection(self.jobs_collection)
-            .document(job_id)
-            .collection("tasks")
-            .order_by("started_at")
-        )
-        
         tasks = []
-        for task_doc in tasks_ref.stream():
+        for task_doc in self._tasks_query(job_id).stream():
             tasks.append(task_doc.to_dict())
         
         return tasks
 
 
-# Global job manager instance
+class AsyncJobManager(_JobStore):
+    """
+    Async counterpart of JobManager for request handlers.
+    
+    Uses a firestore.AsyncClient so reads and task writes can be awaited
+    without blocking the event loop, and fanned out with asyncio.gather.
+    """
+    
+    def __init__(self, db):
+        """
+        Initialize AsyncJobManager.
+        
+        Args:
+            db: Firestore async client
+        """
+        from google.cloud import firestore
+        
+        self._fs = firestore
+        self.db = db
+    
+    async def add_task(self, job_id: str, task: Task) -> None:
+        """
+        Add a task to a job.
+        
+        Args:
+            job_id: Job ID
+            task: Task object to add
+        """
+        await self._task_ref(job_id, task.task_id).set(task.to_dict())
+        logger.debug(f"Added task {task.task_id} to job {job_id}")
+    
+    async def update_task(self, job_id: str, task: Task) -> None:
+        """
+        Update an existing task.
+        
+        Args:
+            job_id: Job ID
+            task: Task object to update
+        """
+        await self._task_ref(job_id, task.task_id).update(task.to_dict())
+        logger.debug(f"Updated task {task.task_id} in job {job_id}")
+    
+    async def get_job(
+        self,
+        job_id: str,
+        include_tasks: bool = False,
+        task_fields: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a job by ID.
+        
+        When tasks are requested, the job and its tasks are fetched concurrently.
+        
+        Args:
+            job_id: Job ID
+            include_tasks: Whether to include tasks in the response
+            task_fields: Task fields to fetch (e.g. TASK_SUMMARY_FIELDS), all when None
+            
+        Returns:
+            Job dictionary with optional tasks list, or None if not found
+        """
+        job_ref = self.db.collection(self.jobs_collection).document(job_id)
+        
+        if not include_tasks:
+            job_doc = await job_ref.get()
+            return job_doc.to_dict() if job_doc.exists else None
+        
+        tasks_ref = job_ref.collection("tasks")
+        if task_fields is not None:
+            tasks_ref = tasks_ref.select(task_fields)
+        
+        async def fetch_tasks() -> List[Dict[str, Any]]:
+            return [task_doc.to_dict() async for task_doc in tasks_ref.stream()]
+        
+        job_doc, tasks = await asyncio.gather(job_ref.get(), fetch_tasks())
+        
+        if not job_doc.exists:
+            return None
+        
+        job_data = job_doc.to_dict()
+        
+        # Sort tasks by started_at
+        tasks.sort(key=lambda t: t.get("started_at") or datetime.min)
+        job_data["tasks"] = tasks
+        
+        return job_data
+    
+    async def list_jobs(
+        self,
+        limit: int = 50,
+        start_after: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List recent jobs, newest first, projected to JOB_LIST_FIELDS.
+        
+        Args:
+            limit: Maximum number of jobs to return
+            start_after: Cursor from the last job of the previous page, as
+                {"started_at": datetime, "job_id": str}
+            
+        Returns:
+            List of job dictionaries
+        """
+        return [job_doc.to_dict() async for job_doc in self._jobs_query(limit, start_after).stream()]
+    
+    async def get_tasks_for_job(self, job_id: str) -> List[Dict[str, Any]]:
+        """
+        Get all tasks for a specific job.
+        
+        Args:
+            job_id: Job ID
+            
+        Returns:
+            List of task dictionaries
+        """
+        return [task_doc.to_dict() async for task_doc in self._tasks_query(job_id).stream()]
+
+
+# Global job manager instances
 _job_manager: Optional[JobManager] = None
+_async_job_manager: Optional[AsyncJobManager] = None
 
 
 def get_job_manager() -> JobManager:
@@ -375,3 +661,12 @@ def get_job_manager() -> JobManager:
         _job_manager = JobManager()
     return _job_manager
 
+
+def get_async_job_manager() -> AsyncJobManager:
+    """Get or create global async job manager instance (shares the cached async Firestore client)."""
+    global _async_job_manager
+    if _async_job_manager is None:
+        from app.core.auth import get_firestore_client
+        _async_job_manager = AsyncJobManager(get_firestore_client())
+    return _async_job_manager
+
@@ -1,14 +1,29 @@
 """Log capture handler for storing pipeline logs in Firestore."""
 import logging
 import threading
-import time
+from collections import deque
+from contextvars import ContextVar
+from functools import lru_cache
 from typing import Optional, Dict, Any, List
-from datetime import datetime, timedelta
-from queue import Queue, Empty
-from google.cloud import firestore
+from datetime import datetime, timedelta, timezone
 
 from app.core.config import get_settings
 
+# (job_id, task_id) of the capture active in the current context. Pipelines of
+# one job can run concurrently; asyncio tasks and asyncio.to_thread carry this
+# value, so each handler can skip records emitted by another capture.
+_active_capture: ContextVar[Optional[tuple]] = ContextVar("active_log_capture", default=None)
+
+
+@lru_cache()
+def _get_firestore_client():
+    """Get the Firestore client shared by every log handler (thread-safe, one gRPC channel)."""
+    # Imported here: loading grpc/protobuf is slow and only needed once logs are captured
+    from google.cloud import firestore
+    
+    settings = get_settings()
+    return firestore.Client(project=settings.gcp_project_id)
+
 
 class FirestoreLogHandler(logging.Handler):
     """Custom logging handler that writes logs to Firestore with batching."""
@@ -18,7 +33,8 @@ class FirestoreLogHandler(logging.Handler):
         job_id: str,
         task_id: Optional[str] = None,
         batch_size: int = 10,
-        flush_interval: float = 2.0
+        flush_interval: float = 2.0,
+        max_buffered: int = 10_000
     ):
         """
         Initialize Firestore log handler.
@@ -26,19 +42,30 @@ class FirestoreLogHandler(logging.Handler):
         Args:
             job_id: Job ID to associate logs with
             task_id: Optional task ID for task-specific logs
-            batch_size: Number of logs to batch before writing
+            batch_size: Number of logs that wakes the writer early
             flush_interval: Maximum time (seconds) to wait before flushing
+            max_buffered: Maximum pending logs; the oldest are dropped beyond it
         """
         super().__init__()
-        settings = get_settings()
-        self.db = firestore.Client(project=settings.gcp_project_id)
+        from google.cloud.firestore_v1.bulk_writer import BulkRetry, BulkWriterOptions
+        
+        self.db = _get_firestore_client()
+        # Log records are independent, so writes go through a BulkWriter:
+        # parallel batches with retry/backoff instead of serial commits
+        self._bw = self.db.bulk_writer(options=BulkWriterOptions(retry=BulkRetry.exponential))
         self.job_id = job_id
         self.task_id = task_id
         self.batch_size = batch_size
         self.flush_interval = flush_interval
         
-        # Queue for batching logs
-        self.log_queue: Queue = Queue()
+        # Fields shared by every entry of this handler
+        self._entry_template: Dict[str, Any] = {"job_id": job_id}
+        if task_id:
+            self._entry_template["task_id"] = task_id
+        
+        # Pending logs: deque append/popleft are thread-safe without a lock
+        self._buf: deque = deque(maxlen=max_buffered)
+        self._wake = threading.Event()
         self.is_running = True
         
         # Background thread for flushing logs
@@ -53,61 +80,54 @@ class FirestoreLogHandler(logging.Handler):
             record: Log record to emit
         """
         try:
-            # Format the log message
-            message = self.format(record)
-            
-            # Create log entry
-            log_entry = {
-                "timestamp": datetime.utcnow(),
-                "level": record.levelname,
-                "message": message,
-                "logger_name": record.name,
-                "job_id": self.job_id,
-            }
+            # Skip records logged while another capture is active in that context
+            active = _active_capture.get()
+            if active is not None and active != (self.job_id, self.task_id):
+                return
             
-            # Add task_id if available
-            if self.task_id:
-                log_entry["task_id"] = self.task_id
+            # Create log entry; the record's creation time (already taken by
+            # logging) is converted to a datetime by the writer thread
+            log_entry = self._entry_template.copy()
+            log_entry["created"] = record.created
+            log_entry["level"] = record.levelname
+            # Time, level and logger ship as their own fields, so the message is
+            # the bare text; only records carrying a traceback go through format()
+            log_entry["message"] = self.format(record) if record.exc_info or record.stack_info else record.getMessage()
+            log_entry["logger_name"] = record.name
             
-            # Add to queue
-            self.log_queue.put(log_entry)
+            # Buffer, waking the writer once a batch is ready
+            self._buf.append(log_entry)
+            if len(self._buf) >= self.batch_size:
+                self._wake.set()
             
         except Exception:
             self.handleError(record)
     
+    def _drain(self) -> List[Dict[str, Any]]:
+        """Take every buffered log entry."""
+        batch = []
+        while self._buf:
+            try:
+                batch.append(self._buf.popleft())
+            except IndexError:
+                break
+        return batch
+    
     def _flush_worker(self) -> None:
         """Background worker that flushes logs to Firestore."""
-        batch: List[Dict[str, Any]] = []
-        last_flush = time.time()
-        
         while self.is_running:
             try:
-                # Try to get log with timeout
-                try:
-                    log_entry = self.log_queue.get(timeout=0.5)
-                    batch.append(log_entry)
-                except Empty:
-                    pass
-                
-                # Flush if batch is full or time interval exceeded
-                current_time = time.time()
-                should_flush = (
-                    len(batch) >= self.batch_size or
-                    (batch and current_time - last_flush >= self.flush_interval)
-                )
-                
-                if should_flush:
-                    self._write_batch(batch)
-                    batch = []
-                    last_flush = current_time
+                # Wake when a batch is ready, on close, or after flush_interval
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                self._write_batch(self._drain())
                     
             except Exception as e:
                 # Log error but don't crash the thread
                 print(f"Error in log flush worker: {e}")
         
         # Final flush on shutdown
-        if batch:
-            self._write_batch(batch)
+        self._write_batch(self._drain())
     
     def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
         """
@@ -120,8 +140,6 @@ class FirestoreLogHandler(logging.Handler):
             return
         
         try:
-            # Use batch write for efficiency
-            db_batch = self.db.batch()
             logs_collection = (
                 self.db.collection("jobs")
                 .document(self.job_id)
@@ -129,27 +147,33 @@ class FirestoreLogHandler(logging.Handler):
             )
             
             for log_entry in batch:
-                doc_ref = logs_collection.document()
-                db_batch.set(doc_ref, log_entry)
+                log_entry["timestamp"] = datetime.fromtimestamp(log_entry.pop("created"), tz=timezone.utc)
+                self._bw.create(logs_collection.document(), log_entry)
             
-            db_batch.commit()
+            # Wait for this drain to be sent so logs show up within flush_interval
+            self._bw.flush()
             
         except Exception as e:
             print(f"Failed to write logs to Firestore: {e}")
     
     def flush(self) -> None:
-        """Flush any buffered logs."""
-        # Give worker thread time to process remaining logs
-        time.sleep(self.flush_interval + 0.5)
+        """Flush any buffered logs (wakes the writer thread, which owns the BulkWriter)."""
+        self._wake.set()
     
     def close(self) -> None:
         """Close the handler and stop background thread."""
         self.is_running = False
+        self._wake.set()
         
         # Wait for worker thread to finish
         if self.flush_thread.is_alive():
             self.flush_thread.join(timeout=5.0)
         
+        try:
+            self._bw.close()
+        except Exception as e:
+            print(f"Failed to close log bulk writer: {e}")
+        
         super().close()
 
 
@@ -175,26 +199,29 @@ class LogCaptureContext:
         self.logger_name = logger_name
         self.handler: Optional[FirestoreLogHandler] = None
         self.logger: Optional[logging.Logger] = None
+        self._capture_token = None
     
     def __enter__(self) -> 'LogCaptureContext':
         """Start capturing logs."""
         # Create handler
         self.handler = FirestoreLogHandler(self.job_id, self.task_id)
         
-        # Set formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        self.handler.setFormatter(formatter)
+        # Set formatter (message only; timestamp, level and logger are stored separately)
+        self.handler.setFormatter(logging.Formatter('%(message)s'))
         
         # Add to logger
         self.logger = logging.getLogger(self.logger_name)
         self.logger.addHandler(self.handler)
+        self._capture_token = _active_capture.set((self.job_id, self.task_id))
         
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Stop capturing logs."""
+        if self._capture_token is not None:
+            _active_capture.reset(self._capture_token)
+            self._capture_token = None
+        
         if self.handler and self.logger:
             # Remove handler
             self.logger.removeHandler(self.handler)
@@ -215,40 +242,28 @@ def cleanup_old_logs(days: int = 30) -> int:
     Returns:
         Number of log documents deleted
     """
-    settings = get_settings()
-    db = firestore.Client(project=settings.gcp_project_id)
+    db = _get_firestore_client()
     
     cutoff_date = datetime.utcnow() - timedelta(days=days)
     deleted_count = 0
     
     try:
-        # Iterate through all jobs
-        jobs_ref = db.collection("jobs")
+        from google.cloud.firestore_v1.base_query import FieldFilter
         
-        for job_doc in jobs_ref.stream():
-            logs_ref = job_doc.reference.collection("logs")
-            
-            # Query old logs
-            old_logs_query = logs_ref.where("timestamp", "<", cutoff_date).limit(500)
-            
-            # Delete in batches
-            batch = db.batch()
-            batch_count = 0
-            
+        # One query across every job's logs subcollection; deletes are spread
+        # over parallel batches by the BulkWriter. Needs a collection-group
+        # index on logs.timestamp.
+        old_logs_query = db.collection_group("logs").where(
+            filter=FieldFilter("timestamp", "<", cutoff_date)
+        ).select([])
+        
+        bulk_writer = db.bulk_writer()
+        try:
             for log_doc in old_logs_query.stream():
-                batch.delete(log_doc.reference)
-                batch_count += 1
+                bulk_writer.delete(log_doc.reference)
                 deleted_count += 1
-                
-                # Commit batch every 500 deletes
-                if batch_count >= 500:
-                    batch.commit()
-                    batch = db.batch()
-                    batch_count = 0
-            
-            # Commit remaining
-            if batch_count > 0:
-                batch.commit()
+        finally:
+            bulk_writer.close()
         
         return deleted_count
         
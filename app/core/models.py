@@ -1,5 +1,5 @@
 """Pydantic models for API requests and responses."""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -22,6 +22,8 @@ class PipelineStatus(str, Enum):
 
 class PipelineRunRequest(BaseModel):
     """Request to run a pipeline."""
+    model_config = ConfigDict(frozen=True)
+    
     pipeline_name: str = Field(..., description="Name of the pipeline to run")
     layer: PipelineLayer = Field(..., description="Pipeline layer (bronze/silver/gold)")
     force: bool = Field(default=False, description="Force reprocessing of all files")
@@ -29,6 +31,8 @@ class PipelineRunRequest(BaseModel):
 
 class FullPipelineRunRequest(BaseModel):
     """Request to run the full pipeline."""
+    model_config = ConfigDict(frozen=True)
+    
     bronze_only: bool = Field(default=False, description="Run only bronze layer")
     silver_only: bool = Field(default=False, description="Run only silver layer")
     force: bool = Field(default=False, description="Force reprocessing")
@@ -36,6 +40,8 @@ class FullPipelineRunRequest(BaseModel):
 
 class PipelineRunResponse(BaseModel):
     """Response for pipeline run."""
+    model_config = ConfigDict(frozen=True)
+    
     run_id: str = Field(..., description="Unique run identifier")
     pipeline_name: str
     layer: PipelineLayer
@@ -46,6 +52,8 @@ class PipelineRunResponse(BaseModel):
 
 class PipelineStatusResponse(BaseModel):
     """Response for pipeline status query."""
+    model_config = ConfigDict(frozen=True)
+    
     run_id: str
     pipeline_name: str
     layer: PipelineLayer
@@ -60,6 +68,8 @@ class PipelineStatusResponse(BaseModel):
 
 class PipelineInfo(BaseModel):
     """Information about a registered pipeline."""
+    model_config = ConfigDict(frozen=True)
+    
     name: str
     layer: PipelineLayer
     description: Optional[str] = None
@@ -69,6 +79,8 @@ class PipelineInfo(BaseModel):
 
 class FileUploadResponse(BaseModel):
     """Response for file upload."""
+    model_config = ConfigDict(frozen=True)
+    
     filename: str
     destination: str
     size_bytes: int
@@ -77,11 +89,15 @@ class FileUploadResponse(BaseModel):
 
 class PipelineListResponse(BaseModel):
     """List of available pipelines."""
+    model_config = ConfigDict(frozen=True)
+    
     pipelines: List[PipelineInfo]
 
 
 class HealthResponse(BaseModel):
     """Health check response."""
+    model_config = ConfigDict(frozen=True)
+    
     status: str = "healthy"
     timestamp: datetime
     version: str = "1.0.0"
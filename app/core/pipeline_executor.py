@@ -1,5 +1,7 @@
 """Pipeline execution engine with DAG-based dependency resolution."""
 import asyncio
+from collections import deque
+from itertools import islice
 from typing import List, Dict, Any, Set, Optional
 from datetime import datetime
 import uuid
@@ -26,14 +28,24 @@ class PipelineExecutionState:
         self.completed_at: Optional[datetime] = None
         self.result: Optional[Dict[str, Any]] = None
         self.error: Optional[str] = None
+        # Serialized form, kept once the execution has completed
+        self._frozen_dict: Optional[Dict[str, Any]] = None
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert state to dictionary."""
+        """
+        Convert state to dictionary.
+        
+        A completed execution no longer changes, so its dictionary is built
+        once and shared by later calls; callers must not modify it.
+        """
+        if self._frozen_dict is not None:
+            return self._frozen_dict
+        
         duration = None
         if self.started_at and self.completed_at:
             duration = (self.completed_at - self.started_at).total_seconds()
         
-        return {
+        state_dict = {
             "run_id": self.run_id,
             "pipeline_name": self.pipeline_name,
             "layer": self.layer.value,
@@ -45,72 +57,171 @@ class PipelineExecutionState:
             "error": self.error,
             "stats": self.result if self.result else None
         }
+        
+        if self.completed_at is not None:
+            self._frozen_dict = state_dict
+        return state_dict
 
 
 class PipelineExecutor:
     """Execute pipelines with dependency resolution."""
     
+    # Executions kept in memory; the oldest are dropped beyond it
+    MAX_HISTORY = 10_000
+    
     def __init__(self):
         self.registry = get_registry()
-        self.execution_history: Dict[str, PipelineExecutionState] = {}
+        # Executions in creation order, plus a run ID index over the same states
+        self._history: deque = deque(maxlen=self.MAX_HISTORY)
+        self._history_by_id: Dict[str, PipelineExecutionState] = {}
         self.job_manager = get_job_manager()
         self.current_job_id: Optional[str] = None
         self.cancelled_jobs: Set[str] = set()  # Track cancelled job IDs
+        # Resolved execution orders by (layer, name), with the registry version they were built from
+        self._dep_cache: Dict[tuple, tuple] = {}
+        # Finished tasks waiting to be written in one batch, by job ID
+        self._pending_task_updates: Dict[str, List[Task]] = {}
     
-    def _resolve_dependencies(
-        self,
-        layer: PipelineLayer,
-        name: str,
-        visited: Optional[Set[str]] = None
-    ) -> List[tuple]:
+    def _resolve_dependencies(self, layer: PipelineLayer, name: str) -> List[tuple]:
         """
-        Resolve pipeline dependencies using topological sort.
+        Resolve pipeline dependencies using topological sort (Kahn's algorithm).
         
         Args:
             layer: Pipeline layer
             name: Pipeline name
-            visited: Set of already visited pipelines (for cycle detection)
             
         Returns:
             List of (layer, name) tuples in execution order
+            
+        Raises:
+            ValueError: If the dependencies contain a cycle
+        """
+        adjacency = self.registry.build_adjacency()
+        
+        # Collect the subgraph reachable from the target
+        target = (layer, name)
+        subgraph: Dict[tuple, tuple] = {}
+        queue = deque([target])
+        while queue:
+            node = queue.popleft()
+            if node in subgraph:
+                continue
+            subgraph[node] = adjacency.get(node, ())
+            queue.extend(subgraph[node])
+        
+        # In-degree is the number of dependencies; edges run from a dependency to its dependents
+        in_degree = {node: len(set(deps)) for node, deps in subgraph.items()}
+        dependents: Dict[tuple, List[tuple]] = {node: [] for node in subgraph}
+        for node, deps in subgraph.items():
+            for dep in set(deps):
+                dependents[dep].append(node)
+        
+        ready = deque(node for node, degree in in_degree.items() if degree == 0)
+        execution_order = []
+        while ready:
+            node = ready.popleft()
+            execution_order.append(node)
+            for dependent in dependents[node]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    ready.append(dependent)
+        
+        if len(execution_order) != len(subgraph):
+            cyclic = ", ".join(f"{l.value}.{n}" for l, n in subgraph if in_degree[(l, n)] > 0)
+            raise ValueError(f"Circular dependency detected: {cyclic}")
+        
+        return execution_order
+    
+    def _dependency_levels(self, execution_order: List[tuple]) -> List[List[tuple]]:
         """
-        if visited is None:
-            visited = set()
+        Group pipelines in execution order into levels that can run concurrently.
         
-        full_name = f"{layer.value}.{name}"
+        A pipeline's level is one more than the highest level of its
+        dependencies, so no pipeline shares a level with anything it depends on.
         
-        # Check for circular dependencies
-        if full_name in visited:
-            raise ValueError(f"Circular dependency detected: {full_name}")
+        Args:
+            execution_order: (layer, name) tuples in dependency order
+            
+        Returns:
+            List of levels, each a list of (layer, name) tuples
+        """
+        adjacency = self.registry.build_adjacency()
+        level_of: Dict[tuple, int] = {}
+        levels: List[List[tuple]] = []
+        for layer, name in execution_order:
+            level = 0
+            for dep_key in adjacency.get((layer, name), ()):
+                if dep_key in level_of:
+                    level = max(level, level_of[dep_key] + 1)
+            
+            level_of[(layer, name)] = level
+            if level == len(levels):
+                levels.append([])
+            levels[level].append((layer, name))
         
-        visited.add(full_name)
+        return levels
+    
+    def _layer_waves(self, layer: PipelineLayer) -> List[List[tuple]]:
+        """
+        Group every pipeline of a layer into waves that can run concurrently.
         
-        # Get dependencies for this pipeline
-        dependencies = self.registry.get_dependencies(layer, name)
+        Dependencies on other layers are treated as satisfied, since layers run
+        in order. Each wave only depends on the waves before it.
         
-        # Resolve each dependency recursively
-        execution_order = []
-        for dep in dependencies:
-            if "." in dep:
-                dep_layer_str, dep_name = dep.split(".", 1)
-                dep_layer = PipelineLayer(dep_layer_str)
-                
-                # Recursively resolve sub-dependencies
-                sub_deps = self._resolve_dependencies(dep_layer, dep_name, visited.copy())
-                execution_order.extend(sub_deps)
-        
-        # Add this pipeline after its dependencies
-        execution_order.append((layer, name))
-        
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_order = []
-        for item in execution_order:
-            if item not in seen:
-                seen.add(item)
-                unique_order.append(item)
-        
-        return unique_order
+        Args:
+            layer: Pipeline layer
+            
+        Returns:
+            List of waves, each a list of (layer, name) tuples
+            
+        Raises:
+            ValueError: If the layer's dependencies contain a cycle
+        """
+        adjacency = self.registry.build_adjacency()
+        nodes = [(layer, pipeline_info.name) for pipeline_info in self.registry.list_pipelines(layer)]
+        in_layer = set(nodes)
+        remaining = {node: {dep for dep in adjacency.get(node, ()) if dep in in_layer} for node in nodes}
+        
+        waves = []
+        while remaining:
+            wave = [node for node, deps in remaining.items() if not deps]
+            if not wave:
+                cyclic = ", ".join(f"{l.value}.{n}" for l, n in remaining)
+                raise ValueError(f"Circular dependency detected: {cyclic}")
+            waves.append(wave)
+            
+            done = set(wave)
+            for node in wave:
+                del remaining[node]
+            for deps in remaining.values():
+                deps -= done
+        
+        return waves
+    
+    def _finish_task(self, job_id: str, task: Task, defer: bool) -> None:
+        """
+        Write a task's final state, or queue it for the next flush.
+        
+        Args:
+            job_id: Job ID
+            task: Finished task
+            defer: Queue the update instead of writing it
+        """
+        if defer:
+            self._pending_task_updates.setdefault(job_id, []).append(task)
+        else:
+            self.job_manager.update_task(job_id, task)
+    
+    def flush_task_updates(self, job_id: str) -> None:
+        """
+        Write the queued task updates of a job in one batch.
+        
+        Args:
+            job_id: Job ID
+        """
+        tasks = self._pending_task_updates.pop(job_id, None)
+        if tasks:
+            self.job_manager.update_tasks_bulk(job_id, tasks)
     
     async def execute_pipeline(
         self,
@@ -118,7 +229,8 @@ class PipelineExecutor:
         name: str,
         force: bool = False,
         run_id: Optional[str] = None,
-        job_id: Optional[str] = None
+        job_id: Optional[str] = None,
+        defer_task_update: bool = False
     ) -> PipelineExecutionState:
         """
         Execute a single pipeline.
@@ -129,6 +241,8 @@ class PipelineExecutor:
             force: Force reprocessing
             run_id: Optional run ID (generated if not provided)
             job_id: Optional job ID to associate this execution with
+            defer_task_update: Queue the task's final update for flush_task_updates
+                instead of writing it right away
             
         Returns:
             Execution state
@@ -136,19 +250,20 @@ class PipelineExecutor:
         if run_id is None:
             run_id = str(uuid.uuid4())
         
+        full_name = f"{layer.value}.{name}"
         state = PipelineExecutionState(run_id, name, layer)
-        self.execution_history[run_id] = state
+        self._record_execution(state)
         
         # Check if job is cancelled before starting
         if job_id and job_id in self.cancelled_jobs:
-            logger.info(f"Skipping pipeline {layer.value}.{name} - job {job_id} is cancelled")
+            logger.info(f"Skipping pipeline {full_name} - job {job_id} is cancelled")
             state.status = PipelineStatus.FAILED
             state.error = "Job cancelled"
             return state
         
-        logger.info(f"Executing pipeline: {layer.value}.{name} (run_id={run_id})")
+        logger.info(f"Executing pipeline: {full_name} (run_id={run_id})")
         
-        # Create task in job if job_id provided
+        # Task of this execution if job_id provided; written once it starts or fails
         if job_id:
             task = Task(
                 task_id=run_id,
@@ -157,13 +272,12 @@ class PipelineExecutor:
                 status=TaskStatus.PENDING,
                 started_at=datetime.utcnow()
             )
-            self.job_manager.add_task(job_id, task)
         
         # Get pipeline class
-        pipeline_class = self.registry.get(layer, name)
+        pipeline_class = self.registry.get_by_full_name(full_name)
         if pipeline_class is None:
             state.status = PipelineStatus.FAILED
-            state.error = f"Pipeline {layer.value}.{name} not found"
+            state.error = f"Pipeline {full_name} not found"
             logger.error(state.error)
             
             # Update task if part of job
@@ -171,7 +285,7 @@ class PipelineExecutor:
                 task.status = TaskStatus.FAILED
                 task.error = state.error
                 task.completed_at = datetime.utcnow()
-                self.job_manager.update_task(job_id, task)
+                self.job_manager.add_task(job_id, task)
             
             return state
         
@@ -179,10 +293,10 @@ class PipelineExecutor:
         state.status = PipelineStatus.RUNNING
         state.started_at = datetime.utcnow()
         
-        # Update task status to running
+        # Create the task as running
         if job_id:
             task.status = TaskStatus.RUNNING
-            self.job_manager.update_task(job_id, task)
+            self.job_manager.add_task(job_id, task)
         
         try:
             # Instantiate and run pipeline with log capture
@@ -191,14 +305,14 @@ class PipelineExecutor:
             # Capture logs if part of a job
             if job_id:
                 with LogCaptureContext(job_id, run_id):
-                    logger.info(f"Starting pipeline {layer.value}.{name}")
+                    logger.info(f"Starting pipeline {full_name}")
                     
                     # Check for cancellation before running
                     if job_id in self.cancelled_jobs:
                         raise Exception("Job cancelled by user")
                     
                     result = await asyncio.to_thread(pipeline.run, force=force)
-                    logger.info(f"Completed pipeline {layer.value}.{name}")
+                    logger.info(f"Completed pipeline {full_name}")
             else:
                 result = await asyncio.to_thread(pipeline.run, force=force)
             
@@ -230,9 +344,9 @@ class PipelineExecutor:
                 task.message = result.get("message", "")
                 task.error = result.get("error") if result_status == "failed" else None
                 task.stats = result
-                self.job_manager.update_task(job_id, task)
+                self._finish_task(job_id, task, defer_task_update)
             
-            logger.info(f"Pipeline {layer.value}.{name} completed with status: {result_status}")
+            logger.info(f"Pipeline {full_name} completed with status: {result_status}")
             
         except Exception as e:
             state.status = PipelineStatus.FAILED
@@ -248,9 +362,9 @@ class PipelineExecutor:
                 task.error = str(e)
                 task.completed_at = state.completed_at
                 task.duration_seconds = (state.completed_at - state.started_at).total_seconds()
-                self.job_manager.update_task(job_id, task)
+                self._finish_task(job_id, task, defer_task_update)
             
-            logger.error(f"Pipeline {layer.value}.{name} failed: {e}", exc_info=not is_cancelled)
+            logger.error(f"Pipeline {full_name} failed: {e}", exc_info=not is_cancelled)
         
         return state
     
@@ -275,33 +389,119 @@ class PipelineExecutor:
         """
         logger.info(f"Resolving dependencies for {layer.value}.{name}")
         
-        # Resolve execution order
-        try:
-            execution_order = self._resolve_dependencies(layer, name)
-        except ValueError as e:
-            logger.error(f"Dependency resolution failed: {e}")
-            raise
+        # Resolve execution order, reusing it until the registry changes
+        cache_key = (layer.value, name)
+        cached = self._dep_cache.get(cache_key)
+        if cached is not None and cached[1] == self.registry.version:
+            execution_order = cached[0]
+        else:
+            try:
+                execution_order = tuple(self._resolve_dependencies(layer, name))
+            except ValueError as e:
+                logger.error(f"Dependency resolution failed: {e}")
+                raise
+            self._dep_cache[cache_key] = (execution_order, self.registry.version)
         
         logger.info(f"Execution order: {execution_order}")
         
-        # Execute each pipeline in order
+        # Execute level by level; pipelines within a level run concurrently
         results = []
-        for exec_layer, exec_name in execution_order:
-            # Check for cancellation before starting next pipeline
+        for level in self._dependency_levels(execution_order):
+            # Check for cancellation before starting next level
             if job_id and job_id in self.cancelled_jobs:
                 logger.info(f"Job {job_id} cancelled, stopping execution")
                 break
             
-            state = await self.execute_pipeline(exec_layer, exec_name, force=force, job_id=job_id)
-            results.append(state)
+            try:
+                states = await asyncio.gather(*(
+                    self.execute_pipeline(
+                        exec_layer, exec_name, force=force, job_id=job_id, defer_task_update=True
+                    )
+                    for exec_layer, exec_name in level
+                ))
+            finally:
+                if job_id:
+                    self.flush_task_updates(job_id)
+            results.extend(states)
             
             # Stop if a pipeline failed
-            if state.status == PipelineStatus.FAILED:
-                logger.error(f"Stopping execution due to failure in {exec_layer.value}.{exec_name}")
+            failed = [state for state in states if state.status == PipelineStatus.FAILED]
+            if failed:
+                failed_names = ", ".join(f"{s.layer.value}.{s.pipeline_name}" for s in failed)
+                logger.error(f"Stopping execution due to failure in {failed_names}")
                 break
         
         return results
     
+    async def _run_layer(
+        self,
+        layer: PipelineLayer,
+        job_id: str,
+        force: bool,
+        total_tasks: int,
+        completed: int,
+        failed: int,
+        results: List[PipelineExecutionState]
+    ) -> tuple[int, int, bool]:
+        """
+        Run every pipeline of a layer wave by wave for a full-pipeline job.
+        
+        Pipelines of a wave don't depend on each other and run concurrently.
+        Job progress is updated after each wave, and no further wave starts
+        once the job is cancelled or a pipeline has failed.
+        
+        Args:
+            layer: Pipeline layer to run
+            job_id: Full-pipeline job ID
+            force: Force reprocessing
+            total_tasks: Total task count of the job
+            completed: Tasks completed so far in the job
+            failed: Tasks failed so far in the job
+            results: Execution states of the job, extended in place
+            
+        Returns:
+            Tuple of (completed, failed, stopped early)
+        """
+        execute_pipeline = self.execute_pipeline
+        update_job_progress = self.job_manager.update_job_progress
+        
+        for wave in self._layer_waves(layer):
+            # Check for cancellation
+            if job_id in self.cancelled_jobs:
+                logger.info(f"Job {job_id} cancelled, stopping execution")
+                return completed, failed, True
+            
+            try:
+                states = await asyncio.gather(*(
+                    execute_pipeline(exec_layer, exec_name, force=force, job_id=job_id, defer_task_update=True)
+                    for exec_layer, exec_name in wave
+                ))
+            finally:
+                # One batched write for the wave's finished tasks
+                self.flush_task_updates(job_id)
+            results.extend(states)
+            
+            for state in states:
+                if state.status == PipelineStatus.SUCCESS:
+                    completed += 1
+                elif state.status == PipelineStatus.FAILED:
+                    failed += 1
+                    logger.error(f"Task {state.pipeline_name} failed, stopping remaining pipelines")
+            
+            # Update job progress
+            update_job_progress(
+                job_id,
+                total_tasks=total_tasks,
+                completed_tasks=completed,
+                failed_tasks=failed
+            )
+            
+            # Fail-fast: don't start the next wave after a failure
+            if failed:
+                return completed, failed, True
+        
+        return completed, failed, False
+    
     async def execute_full_pipeline(
         self,
         bronze_only: bool = False,
@@ -356,39 +556,9 @@ class PipelineExecutor:
             # Run bronze layer
             if not silver_only:
                 logger.info("Running all bronze pipelines")
-                bronze_pipelines = self.registry.list_pipelines(PipelineLayer.BRONZE)
-                
-                for pipeline_info in bronze_pipelines:
-                    # Check for cancellation
-                    if job_id in self.cancelled_jobs:
-                        logger.info(f"Job {job_id} cancelled, stopping execution")
-                        break
-                    
-                    state = await self.execute_pipeline(
-                        PipelineLayer.BRONZE,
-                        pipeline_info.name,
-                        force=force,
-                        job_id=job_id
-                    )
-                    results.append(state)
-                    
-                    if state.status == PipelineStatus.SUCCESS:
-                        completed += 1
-                    elif state.status == PipelineStatus.FAILED:
-                        failed += 1
-                        # Fail-fast: Stop execution on first failure
-                        logger.error(f"Task {pipeline_info.name} failed, stopping remaining pipelines")
-                    
-                    # Update job progress
-                    self.job_manager.update_job_progress(
-                        job_id,
-                        completed_tasks=completed,
-                        failed_tasks=failed
-                    )
-                    
-                    # Break on first failure (fail-fast)
-                    if state.status == PipelineStatus.FAILED:
-                        break
+                completed, failed, _ = await self._run_layer(
+                    PipelineLayer.BRONZE, job_id, force, total_tasks, completed, failed, results
+                )
             
             # Check for cancellation before starting silver layer
             if job_id in self.cancelled_jobs:
@@ -404,41 +574,10 @@ class PipelineExecutor:
             # Run silver layer (only if no failures in bronze and not bronze_only)
             if not bronze_only and failed == 0:
                 logger.info("Running all silver pipelines")
-                silver_pipelines = self.registry.list_pipelines(PipelineLayer.SILVER)
-                
-                for pipeline_info in silver_pipelines:
-                    # Check for cancellation
-                    if job_id in self.cancelled_jobs:
-                        logger.info(f"Job {job_id} cancelled, stopping execution")
-                        break
-                    
-                    # In full pipeline mode, bronze is already run, so don't re-run dependencies
-                    # Just run the silver pipeline directly
-                    state = await self.execute_pipeline(
-                        PipelineLayer.SILVER,
-                        pipeline_info.name,
-                        force=force,
-                        job_id=job_id
-                    )
-                    results.append(state)
-                    
-                    if state.status == PipelineStatus.SUCCESS:
-                        completed += 1
-                    elif state.status == PipelineStatus.FAILED:
-                        failed += 1
-                        # Fail-fast: Stop execution on first failure
-                        logger.error(f"Task {pipeline_info.name} failed, stopping remaining pipelines")
-                    
-                    # Update job progress
-                    self.job_manager.update_job_progress(
-                        job_id,
-                        completed_tasks=completed,
-                        failed_tasks=failed
-                    )
-                    
-                    # Break on first failure (fail-fast)
-                    if state.status == PipelineStatus.FAILED:
-                        break
+                # In full pipeline mode, bronze is already run, so don't re-run dependencies
+                completed, failed, _ = await self._run_layer(
+                    PipelineLayer.SILVER, job_id, force, total_tasks, completed, failed, results
+                )
             
             # Determine final job status
             # Check if job was cancelled
@@ -471,6 +610,19 @@ class PipelineExecutor:
         
         return job_id, results
     
+    def _record_execution(self, state: PipelineExecutionState) -> None:
+        """
+        Add an execution to the bounded history.
+        
+        Args:
+            state: Execution state of a new run
+        """
+        if len(self._history) == self._history.maxlen:
+            evicted = self._history[0]
+            self._history_by_id.pop(evicted.run_id, None)
+        self._history.append(state)
+        self._history_by_id[state.run_id] = state
+    
     def get_execution_state(self, run_id: str) -> Optional[PipelineExecutionState]:
         """
         Get execution state by run ID.
@@ -481,7 +633,7 @@ class PipelineExecutor:
         Returns:
             Execution state or None
         """
-        return self.execution_history.get(run_id)
+        return self._history_by_id.get(run_id)
     
     def get_execution_history(self, limit: int = 50) -> List[Dict[str, Any]]:
         """
@@ -493,14 +645,8 @@ class PipelineExecutor:
         Returns:
             List of execution states as dictionaries
         """
-        # Sort by started_at descending
-        sorted_executions = sorted(
-            self.execution_history.values(),
-            key=lambda x: x.started_at or datetime.min,
-            reverse=True
-        )
-        
-        return [state.to_dict() for state in sorted_executions[:limit]]
+        # The history is already chronological: walk it newest first
+        return [state.to_dict() for state in islice(reversed(self._history), limit)]
     
     def cancel_job(self, job_id: str) -> bool:
         """
@@ -1,10 +1,14 @@
 """Pipeline registry for managing and discovering pipelines."""
-from typing import Dict, List, Type, Optional
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple, Type, Optional
 from app.core.models import PipelineLayer, PipelineInfo
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Layer enum members by value, avoiding PipelineLayer(...) lookups
+_LAYER: Dict[str, PipelineLayer] = {member.value: member for member in PipelineLayer}
+
 
 class PipelineRegistry:
     """Central registry for all data pipelines."""
@@ -15,8 +19,26 @@ class PipelineRegistry:
             "silver": {},
             "gold": {}
         }
+        # Pipeline classes by "layer.name"
+        self._flat: Dict[str, Type] = {}
         self._dependencies: Dict[str, List[str]] = {}
         self._descriptions_fr: Dict[str, str] = {}
+        # PipelineInfo built once per registration, by layer then name
+        self._info_by_layer: Dict[str, Dict[str, PipelineInfo]] = {
+            "bronze": {},
+            "silver": {},
+            "gold": {}
+        }
+        self._adjacency: Optional[Dict[Tuple[PipelineLayer, str], Tuple[Tuple[PipelineLayer, str], ...]]] = None
+        # Bumped on every registration so callers can invalidate derived caches
+        self._version = 0
+        # Set by freeze(): the tables above are read-only snapshots
+        self._frozen = False
+    
+    @property
+    def version(self) -> int:
+        """Registration counter, bumped whenever a pipeline is (re-)registered."""
+        return self._version
     
     def register(
         self,
@@ -36,6 +58,15 @@ class PipelineRegistry:
             dependencies: List of pipeline names this pipeline depends on
             description_fr: French description of the pipeline
         """
+        if self._frozen:
+            # Copy-on-write: update private copies, then publish a new snapshot
+            self._thaw()
+            try:
+                self.register(layer, name, pipeline_class, dependencies, description_fr)
+            finally:
+                self.freeze()
+            return
+        
         layer_str = layer.value if isinstance(layer, PipelineLayer) else layer
         
         if name in self._pipelines[layer_str]:
@@ -43,16 +74,63 @@ class PipelineRegistry:
         
         self._pipelines[layer_str][name] = pipeline_class
         
-        # Store dependencies
         full_name = f"{layer_str}.{name}"
+        self._flat[full_name] = pipeline_class
+        
+        # Store dependencies
         self._dependencies[full_name] = dependencies or []
         
         # Store French description
         if description_fr:
             self._descriptions_fr[full_name] = description_fr
         
+        description = pipeline_class.__doc__
+        if description:
+            description = description.strip().split('\n')[0]
+        
+        info = PipelineInfo(
+            name=name,
+            layer=_LAYER[layer_str],
+            description=description,
+            description_fr=self._descriptions_fr.get(full_name),
+            dependencies=self._dependencies[full_name]
+        )
+        self._info_by_layer[layer_str][name] = info
+        
+        self._adjacency = None
+        self._version += 1
+        
         logger.info(f"Registered pipeline: {full_name}")
     
+    def freeze(self) -> None:
+        """
+        Replace the registry tables with read-only snapshots.
+        
+        Called once startup registration is done. Later registrations still
+        work: they copy the tables and swap in a new snapshot.
+        """
+        self._pipelines = MappingProxyType({
+            layer: MappingProxyType(dict(by_name)) for layer, by_name in self._pipelines.items()
+        })
+        self._flat = MappingProxyType(dict(self._flat))
+        self._dependencies = MappingProxyType({
+            full_name: tuple(dependencies) for full_name, dependencies in self._dependencies.items()
+        })
+        self._descriptions_fr = MappingProxyType(dict(self._descriptions_fr))
+        self._info_by_layer = MappingProxyType({
+            layer: MappingProxyType(dict(by_name)) for layer, by_name in self._info_by_layer.items()
+        })
+        self._frozen = True
+    
+    def _thaw(self) -> None:
+        """Replace the read-only snapshots with mutable copies."""
+        self._pipelines = {layer: dict(by_name) for layer, by_name in self._pipelines.items()}
+        self._flat = dict(self._flat)
+        self._dependencies = {full_name: list(dependencies) for full_name, dependencies in self._dependencies.items()}
+        self._descriptions_fr = dict(self._descriptions_fr)
+        self._info_by_layer = {layer: dict(by_name) for layer, by_name in self._info_by_layer.items()}
+        self._frozen = False
+    
     def get(self, layer: PipelineLayer, name: str) -> Optional[Type]:
         """
         Get a pipeline class by layer and name.
@@ -67,6 +145,18 @@ class PipelineRegistry:
         layer_str = layer.value if isinstance(layer, PipelineLayer) else layer
         return self._pipelines.get(layer_str, {}).get(name)
     
+    def get_by_full_name(self, full_name: str) -> Optional[Type]:
+        """
+        Get a pipeline class by its full name.
+        
+        Args:
+            full_name: Pipeline full name (format: "layer.name")
+            
+        Returns:
+            Pipeline class or None if not found
+        """
+        return self._flat.get(full_name)
+    
     def list_pipelines(self, layer: Optional[PipelineLayer] = None) -> List[PipelineInfo]:
         """
         List all registered pipelines.
@@ -77,26 +167,28 @@ class PipelineRegistry:
         Returns:
             List of pipeline information
         """
-        pipelines = []
+        if layer:
+            return list(self._info_by_layer[layer.value].values())
         
-        layers_to_check = [layer.value] if layer else ["bronze", "silver", "gold"]
+        pipelines = []
+        for layer_name in ("bronze", "silver", "gold"):
+            pipelines.extend(self._info_by_layer[layer_name].values())
+        return pipelines
+    
+    def pipelines_by_layer(self, layer: PipelineLayer) -> Mapping[str, PipelineInfo]:
+        """
+        Get the pipelines of a layer indexed by name.
         
-        for layer_name in layers_to_check:
-            for name, pipeline_class in self._pipelines[layer_name].items():
-                full_name = f"{layer_name}.{name}"
-                description = pipeline_class.__doc__
-                if description:
-                    description = description.strip().split('\n')[0]
-                
-                pipelines.append(PipelineInfo(
-                    name=name,
-                    layer=PipelineLayer(layer_name),
-                    description=description,
-                    description_fr=self._descriptions_fr.get(full_name),
-                    dependencies=self._dependencies.get(full_name, [])
-                ))
+        The mapping is maintained by register(); callers must not modify it.
         
-        return pipelines
+        Args:
+            layer: Pipeline layer
+            
+        Returns:
+            Dictionary mapping pipeline name to its information
+        """
+        layer_str = layer.value if isinstance(layer, PipelineLayer) else layer
+        return self._info_by_layer[layer_str]
     
     def get_dependencies(self, layer: PipelineLayer, name: str) -> List[str]:
         """
@@ -112,6 +204,33 @@ class PipelineRegistry:
         layer_str = layer.value if isinstance(layer, PipelineLayer) else layer
         full_name = f"{layer_str}.{name}"
         return self._dependencies.get(full_name, [])
+    
+    def build_adjacency(self) -> Dict[Tuple[PipelineLayer, str], Tuple[Tuple[PipelineLayer, str], ...]]:
+        """
+        Get the dependency graph with every "layer.name" reference parsed.
+        
+        The graph is built once and reused until another pipeline is registered.
+        
+        Returns:
+            Dictionary mapping each (layer, name) to the (layer, name) tuples it depends on
+        """
+        if self._adjacency is None:
+            adjacency = {}
+            for full_name, dependencies in self._dependencies.items():
+                layer_str, name = full_name.split(".", 1)
+                parsed = []
+                for dep in dependencies:
+                    if "." not in dep:
+                        continue
+                    dep_layer_str, dep_name = dep.split(".", 1)
+                    dep_layer = _LAYER.get(dep_layer_str)
+                    if dep_layer is None:
+                        logger.warning(f"Ignoring dependency {dep} of {full_name}: unknown layer")
+                        continue
+                    parsed.append((dep_layer, dep_name))
+                adjacency[(_LAYER[layer_str], name)] = tuple(parsed)
+            self._adjacency = adjacency
+        return self._adjacency
 
 
 # Global registry instance
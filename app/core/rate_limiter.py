@@ -1,22 +1,91 @@
 """Rate limiting configuration for API DDoS protection."""
+import logging
+import time
 from slowapi import Limiter
+from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from app.core.api_key_manager import hash_api_key
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Catalog browsing policy, approximating a token bucket of 20 tokens refilled
+# at 0.5/s: bursts of up to 20 requests, at most 20 + 30 = 50 per minute.
+CATALOG_RATE_LIMIT = "20/10 seconds;50/minute"
+
+# Default policy for every other route, approximating a token bucket of 10
+# tokens refilled at 1/s: bursts of up to 10 requests, 60 per minute sustained.
+# Moving windows also avoid the 2x burst a fixed window allows at its boundary.
+DEFAULT_RATE_LIMIT = "10/10 seconds;60/minute"
+
+
+def get_api_key_or_remote_address(request: Request) -> str:
+    """
+    Rate limit key: the caller's API key hash, or the client IP when unauthenticated.
+    
+    Args:
+        request: Incoming request
+        
+    Returns:
+        Key identifying the caller
+    """
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        return f"key:{hash_api_key(token)}"
+    return get_remote_address(request)
 
 
 def get_limiter() -> Limiter:
     """
     Get configured rate limiter instance.
     
+    Counters live in `rate_limit_storage_uri`. The default in-memory storage is
+    per process; point it at Redis (redis://host:6379/0) so every worker and
+    instance shares the same budget.
+    
     Returns:
-        Limiter configured for 60 requests per minute per IP address
+        Limiter keyed by client IP address using a moving-window strategy
     """
+    settings = get_settings()
     return Limiter(
         key_func=get_remote_address,
-        default_limits=[]  # No default limits; apply per-route
+        default_limits=[],  # No default limits; apply per-route
+        storage_uri=settings.rate_limit_storage_uri,
+        strategy="moving-window"
     )
 
 
 # Create the limiter instance
 limiter = get_limiter()
 
+
+def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> JSONResponse:
+    """
+    Build the 429 response for a rate-limited request, with a Retry-After header.
+    
+    Retry-After is the number of seconds until the limit that was hit frees a
+    slot, falling back to the length of its window.
+    
+    Args:
+        request: Request that exceeded its limit
+        exc: Exception raised by slowapi
+        
+    Returns:
+        429 JSON response
+    """
+    response = JSONResponse({"error": f"Rate limit exceeded: {exc.detail}"}, status_code=429)
+    current_limit = getattr(request.state, "view_rate_limit", None)
+    if current_limit is not None:
+        limit_item, args = current_limit
+        try:
+            reset_at, _ = limiter.limiter.get_window_stats(limit_item, *args)
+            retry_after = int(reset_at - time.time()) + 1
+        except Exception as e:
+            logger.warning(f"Could not read rate limit window: {e}")
+            retry_after = limit_item.get_expiry()
+        response.headers["Retry-After"] = str(max(1, retry_after))
+    return response
@@ -1,16 +1,18 @@
 """Main FastAPI application."""
+import asyncio
 import logging
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse, Response
 from datetime import datetime
-from slowapi import _rate_limit_exceeded_handler
+from pathlib import Path
 from slowapi.errors import RateLimitExceeded
 
 from app.core.config import get_settings
 from app.core.models import HealthResponse
-from app.core.rate_limiter import limiter
+from app.core.rate_limiter import limiter, rate_limit_exceeded_handler
 from app.api.routes import bronze, silver, gold, pipeline, files, data, jobs, admin, docs
 
 # Configure logging
@@ -24,12 +26,13 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Odace Data Pipeline API",
     description="Platform-agnostic data pipeline for bronze/silver/gold layers",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add rate limiter state and exception handler
 app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
 
 # Configure CORS
 app.add_middleware(
@@ -40,6 +43,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses (catalog, query results, logs)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
@@ -55,16 +61,27 @@ app.include_router(admin.router)
 app.include_router(docs.router)
 
 
+def _load_index_html() -> bytes | None:
+    """Read the main UI page, or None when it is missing."""
+    try:
+        return Path("app/static/index.html").read_bytes()
+    except FileNotFoundError:
+        return None
+
+
 @app.get("/", response_class=HTMLResponse)
 async def root():
     """Serve the main UI."""
-    try:
-        with open("app/static/index.html", "r") as f:
-            return HTMLResponse(content=f.read())
-    except FileNotFoundError:
-        return HTMLResponse(
-            content="<h1>Odace Data Pipeline API</h1><p>Visit <a href='/docs'>/docs</a> for API documentation</p>"
-        )
+    # Read once at startup; loaded here if startup has not run (e.g. tests without lifespan)
+    if not hasattr(app.state, "index_html"):
+        app.state.index_html = _load_index_html()
+    
+    if app.state.index_html is not None:
+        return Response(content=app.state.index_html, media_type="text/html")
+    
+    return HTMLResponse(
+        content="<h1>Odace Data Pipeline API</h1><p>Visit <a href='/docs'>/docs</a> for API documentation</p>"
+    )
 
 
 @app.get("/health", response_model=HealthResponse)
@@ -86,6 +103,9 @@ async def startup_event():
     logger.info(f"GCS Bucket: {settings.gcs_bucket}")
     logger.info(f"Project: {settings.gcp_project_id}")
     
+    # Serve the UI page from memory
+    app.state.index_html = _load_index_html()
+    
     # Load pipelines from YAML configuration
     from app.core.config_loader import get_config_loader
     from app.core.pipeline_registry import register_pipelines_from_yaml, get_registry
@@ -95,6 +115,9 @@ async def startup_event():
         config_loader = get_config_loader()
         register_pipelines_from_yaml(config_loader)
         
+        # Registration is done: serve lookups from read-only snapshots
+        get_registry().freeze()
+        
         # Log registered pipelines
         registry = get_registry()
         bronze_pipelines = registry.list_pipelines(layer=PipelineLayer.BRONZE)
@@ -112,12 +135,42 @@ async def startup_event():
     except Exception as e:
         logger.error(f"Error loading pipelines from YAML: {e}", exc_info=True)
         logger.warning("Continuing without YAML-configured pipelines")
+    
+    # Open the Firestore channel used by API key validation
+    from app.core.auth import warm_firestore_client
+    
+    try:
+        # Bounded so an unreachable Firestore does not hold back serving traffic
+        await asyncio.wait_for(warm_firestore_client(), timeout=settings.firestore_warmup_timeout_seconds)
+        logger.info("Firestore client warmed up")
+    except asyncio.TimeoutError:
+        logger.warning(
+            f"Firestore warm-up timed out after {settings.firestore_warmup_timeout_seconds}s, "
+            f"continuing startup"
+        )
+    except Exception as e:
+        logger.warning(f"Could not warm up Firestore client: {e}")
+    
+    # Warm catalog/schema caches in the background so startup is not delayed
+    app.state.cache_warmup_task = asyncio.create_task(data.warm_caches())
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Shutdown event handler."""
     logger.info("Shutting down Odace Data Pipeline API")
+    
+    # Stop a still-running cache warm-up before its executor pool is closed
+    warmup_task = getattr(app.state, "cache_warmup_task", None)
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+        try:
+            await warmup_task
+        except asyncio.CancelledError:
+            pass
+    
+    from app.utils.sql_executor_pool import close_sql_executor_pool
+    close_sql_executor_pool()
 
 
 if __name__ == "__main__":
@@ -1,14 +1,25 @@
 """Delta Lake operations utilities."""
 import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
 from deltalake import DeltaTable, write_deltalake
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import logging
+import threading
+import time
 from google.cloud import storage
 from app.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Cache of GCS table listings: base_path -> (expires_at, tables)
+_list_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+_list_cache_lock = threading.Lock()
+
+# Cache of table schemas: table_path -> (version_checked_until, delta_version, schema_info)
+_schema_cache: Dict[str, Tuple[float, int, Dict[str, Any]]] = {}
+
 
 class DeltaOperations:
     """Helper class for Delta Lake operations."""
@@ -31,6 +42,22 @@ class DeltaOperations:
         logger.info(f"Read {len(df)} rows from Delta table")
         return df
     
+    @staticmethod
+    def read_delta_arrow(table_path: str) -> pa.Table:
+        """
+        Read a Delta table into a pyarrow Table.
+        
+        Args:
+            table_path: Path to Delta table (gs://bucket/path)
+            
+        Returns:
+            pyarrow Table
+        """
+        logger.info(f"Reading Delta table from {table_path} (arrow)")
+        table = DeltaTable(table_path).to_pyarrow_table()
+        logger.info(f"Read {table.num_rows} rows from Delta table")
+        return table
+    
     @staticmethod
     def write_delta(
         df: pd.DataFrame,
@@ -125,6 +152,9 @@ class DeltaOperations:
                 logger.info(f"Successfully replaced Delta table with new schema")
             else:
                 raise
+        finally:
+            # A new table version may now exist, drop cached listings
+            DeltaOperations.invalidate_table_cache()
     
     @staticmethod
     def table_exists(table_path: str) -> bool:
@@ -293,6 +323,50 @@ class DeltaOperations:
         logger.info(f"Found {len(tables)} Delta tables")
         return tables
     
+    @staticmethod
+    def list_delta_tables_cached(base_path: str) -> List[Dict[str, Any]]:
+        """
+        List Delta tables under a base path, reusing a recent GCS scan if available.
+        
+        Listings are cached per base path for `catalog_cache_ttl_seconds` and
+        dropped whenever a Delta table is written by this process.
+        
+        Args:
+            base_path: Base path to scan (e.g., gs://bucket/delta/bronze)
+            
+        Returns:
+            List of dictionaries with table information
+        """
+        now = time.monotonic()
+        with _list_cache_lock:
+            entry = _list_cache.get(base_path)
+        if entry and entry[0] > now:
+            logger.debug(f"Using cached Delta table listing for {base_path}")
+            return list(entry[1])
+        
+        tables = DeltaOperations.list_delta_tables(base_path)
+        ttl = get_settings().catalog_cache_ttl_seconds
+        with _list_cache_lock:
+            _list_cache[base_path] = (now + ttl, tables)
+        return list(tables)
+    
+    @staticmethod
+    def invalidate_table_cache(base_path: Optional[str] = None) -> None:
+        """
+        Drop cached Delta table listings and schemas.
+        
+        Args:
+            base_path: Base path to invalidate (None = all cached listings)
+        """
+        with _list_cache_lock:
+            if base_path is None:
+                _list_cache.clear()
+                _schema_cache.clear()
+            else:
+                _list_cache.pop(base_path, None)
+                for table_path in [p for p in _schema_cache if p.startswith(f"{base_path}/")]:
+                    _schema_cache.pop(table_path, None)
+    
     @staticmethod
     def get_table_schema(table_path: str) -> Dict[str, Any]:
         """
@@ -336,6 +410,151 @@ class DeltaOperations:
             "num_fields": len(fields)
         }
     
+    @staticmethod
+    def get_table_version(table_path: str) -> int:
+        """
+        Get the current version of a Delta table from its transaction log only.
+        
+        Args:
+            table_path: Path to Delta table
+            
+        Returns:
+            Latest Delta table version
+        """
+        return DeltaTable(table_path, without_files=True).version()
+    
+    @staticmethod
+    def get_table_schema_cached(table_path: str) -> Dict[str, Any]:
+        """
+        Get schema information for a Delta table, reusing it while the version is unchanged.
+        
+        A cached schema is returned without any GCS access for
+        `catalog_cache_ttl_seconds`. After that only the transaction log is read
+        to check the current version; the full schema and row count are
+        recomputed when a new version has been committed.
+        
+        Args:
+            table_path: Path to Delta table
+            
+        Returns:
+            Dictionary with schema information
+        """
+        now = time.monotonic()
+        ttl = get_settings().catalog_cache_ttl_seconds
+        cached = _schema_cache.get(table_path)
+        if cached and cached[0] > now:
+            return cached[2]
+        
+        version = DeltaOperations.get_table_version(table_path)
+        if cached and cached[1] == version:
+            logger.debug(f"Using cached schema for {table_path} (version {version})")
+            _schema_cache[table_path] = (now + ttl, version, cached[2])
+            return cached[2]
+        
+        schema_info = DeltaOperations.get_table_schema(table_path)
+        _schema_cache[table_path] = (now + ttl, schema_info["version"], schema_info)
+        return schema_info
+    
+    @staticmethod
+    def _to_dataset_filter(schema: pa.Schema, filter_spec: Dict[str, str]) -> Optional[ds.Expression]:
+        """
+        Translate a preview filter into a pyarrow dataset expression.
+        
+        "contains" is a case-insensitive literal substring match, as in
+        _apply_pandas_filter. "=" and "!=" on numeric columns compare against
+        the value cast to the column type, so "5" matches 5.
+        
+        Args:
+            schema: Arrow schema of the table being previewed
+            filter_spec: Filter dictionary with 'column', 'operator', 'value'
+            
+        Returns:
+            Dataset expression, or None if the filter has to be applied in pandas
+        """
+        column = filter_spec.get("column")
+        operator = filter_spec.get("operator", "=")
+        value = filter_spec.get("value")
+        
+        if not column or column not in schema.names or value is None:
+            return None
+        
+        field_type = schema.field(column).type
+        is_string = pa.types.is_string(field_type) or pa.types.is_large_string(field_type)
+        is_numeric = pa.types.is_integer(field_type) or pa.types.is_floating(field_type)
+        field = ds.field(column)
+        
+        try:
+            if operator in ("=", "!="):
+                if is_string:
+                    scalar = pa.scalar(value, type=field_type)
+                elif is_numeric:
+                    scalar = pa.scalar(value).cast(field_type)
+                else:
+                    return None
+                if operator == "=":
+                    return field == scalar
+                # pandas keeps nulls for "!=", so match that
+                return (field != scalar) | field.is_null()
+            if operator == "contains":
+                if not is_string:
+                    return None
+                return pc.match_substring(field, value, ignore_case=True)
+            if operator in (">", "<", ">=", "<=") and is_numeric:
+                number = float(value)
+                if operator == ">":
+                    return field > number
+                if operator == "<":
+                    return field < number
+                if operator == ">=":
+                    return field >= number
+                return field <= number
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, ValueError) as e:
+            logger.debug(f"Cannot push down filter {column} {operator} {value}: {e}")
+        
+        return None
+    
+    @staticmethod
+    def _apply_pandas_filter(df: pd.DataFrame, filter_spec: Dict[str, str]) -> pd.DataFrame:
+        """
+        Apply a preview filter to a DataFrame.
+        
+        Used for filters _to_dataset_filter cannot push down; "contains" is a
+        literal match here too, so both paths return the same rows.
+        
+        Args:
+            df: DataFrame to filter
+            filter_spec: Filter dictionary with 'column', 'operator', 'value'
+            
+        Returns:
+            Filtered DataFrame (unchanged if the filter cannot be applied)
+        """
+        column = filter_spec.get("column")
+        operator = filter_spec.get("operator", "=")
+        value = filter_spec.get("value")
+        
+        if not column or column not in df.columns:
+            return df
+        
+        try:
+            if operator == "=":
+                return df[df[column] == value]
+            elif operator == "!=":
+                return df[df[column] != value]
+            elif operator == "contains":
+                return df[df[column].astype(str).str.contains(value, case=False, na=False, regex=False)]
+            elif operator == ">":
+                return df[df[column] > float(value)]
+            elif operator == "<":
+                return df[df[column] < float(value)]
+            elif operator == ">=":
+                return df[df[column] >= float(value)]
+            elif operator == "<=":
+                return df[df[column] <= float(value)]
+        except Exception as e:
+            logger.warning(f"Filter failed for {column} {operator} {value}: {e}")
+        
+        return df
+    
     @staticmethod
     def preview_table(
         table_path: str,
@@ -359,55 +578,52 @@ class DeltaOperations:
         """
         logger.info(f"Previewing table {table_path} (limit={limit})")
         
-        dt = DeltaTable(table_path)
-        df = dt.to_pandas()
+        dataset = DeltaTable(table_path).to_pyarrow_dataset()
+        total_rows = dataset.count_rows()
+        
+        # Push supported filters down to the Parquet scan; keep the rest for pandas
+        expression = None
+        pandas_filters = []
+        for filter_spec in filters or []:
+            filter_expression = DeltaOperations._to_dataset_filter(dataset.schema, filter_spec)
+            if filter_expression is None:
+                pandas_filters.append(filter_spec)
+            elif expression is None:
+                expression = filter_expression
+            else:
+                expression = expression & filter_expression
         
-        total_rows = len(df)
+        needs_sort = bool(sort_by and sort_by in dataset.schema.names)
         
-        # Apply filters if provided
-        if filters:
-            for filter_spec in filters:
-                column = filter_spec.get("column")
-                operator = filter_spec.get("operator", "=")
-                value = filter_spec.get("value")
-                
-                if column and column in df.columns:
-                    try:
-                        if operator == "=":
-                            df = df[df[column] == value]
-                        elif operator == "!=":
-                            df = df[df[column] != value]
-                        elif operator == "contains":
-                            df = df[df[column].astype(str).str.contains(value, case=False, na=False)]
-                        elif operator == ">":
-                            df = df[df[column] > float(value)]
-                        elif operator == "<":
-                            df = df[df[column] < float(value)]
-                        elif operator == ">=":
-                            df = df[df[column] >= float(value)]
-                        elif operator == "<=":
-                            df = df[df[column] <= float(value)]
-                    except Exception as e:
-                        logger.warning(f"Filter failed for {column} {operator} {value}: {e}")
-        
-        filtered_rows = len(df)
-        
-        # Apply sorting if provided
-        if sort_by and sort_by in df.columns:
-            ascending = (sort_order.lower() == "asc")
-            df = df.sort_values(by=sort_by, ascending=ascending)
-        
-        # Limit rows
-        df_preview = df.head(limit)
+        if not pandas_filters and not needs_sort:
+            # Only the first `limit` matching rows are materialized
+            filtered_rows = dataset.count_rows(filter=expression)
+            df_preview = dataset.head(limit, filter=expression).to_pandas()
+        else:
+            df = dataset.to_table(filter=expression).to_pandas()
+            for filter_spec in pandas_filters:
+                df = DeltaOperations._apply_pandas_filter(df, filter_spec)
+            
+            filtered_rows = len(df)
+            
+            # Apply sorting if provided
+            if needs_sort:
+                ascending = (sort_order.lower() == "asc")
+                df = df.sort_values(by=sort_by, ascending=ascending)
+            
+            # Limit rows
+            df_preview = df.head(limit)
         
         # Convert to records for JSON serialization
         # Handle datetime and other special types
         df_preview = df_preview.copy()
+        not_null = df_preview.notna()
         for col in df_preview.columns:
             if pd.api.types.is_datetime64_any_dtype(df_preview[col]):
                 df_preview[col] = df_preview[col].astype(str)
         
-        records = df_preview.to_dict(orient="records")
+        # Map NaN/NaT to None in one vectorized pass
+        records = df_preview.astype(object).where(not_null, None).to_dict(orient="records")
         columns = list(df_preview.columns)
         
         return {
@@ -7,6 +7,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Chunk size for resumable uploads (must be a multiple of 256 KB)
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
 
 class GCSOperations:
     """Helper class for Google Cloud Storage operations."""
@@ -78,12 +81,15 @@ class GCSOperations:
         path = gcs_path.replace(f"gs://{self.settings.gcs_bucket}/", "")
         blob = self.bucket.blob(path)
         
-        # Read file content
+        # Stream the file instead of reading it into memory; with a known size
+        # small files go in one multipart request, larger ones in resumable chunks
+        local_file.seek(0, io.SEEK_END)
+        size = local_file.tell()
         local_file.seek(0)
-        content = local_file.read()
+        blob.chunk_size = UPLOAD_CHUNK_SIZE
         
-        blob.upload_from_string(content)
-        logger.info(f"Uploaded file to {gcs_path}")
+        blob.upload_from_file(local_file, size=size)
+        logger.info(f"Uploaded file to {gcs_path} ({size} bytes)")
         return gcs_path
     
     def upload_from_string(self, content: str, gcs_path: str) -> str:
@@ -0,0 +1,22 @@
+"""Conditional request helpers shared by ETag-aware endpoints."""
+from typing import Optional
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against the current ETag.
+    
+    Handles comma-separated lists, weak validators (W/) and the * wildcard.
+    
+    Args:
+        if_none_match: Raw If-None-Match header value, if any
+        etag: Quoted ETag of the current content
+    
+    Returns:
+        True if the client already has this version
+    """
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
@@ -1,7 +1,10 @@
 """SQL execution using DuckDB with Delta Lake support."""
 import duckdb
 import pandas as pd
-from typing import Optional, Dict, Any
+import pyarrow as pa
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Iterable, List, Tuple
 import logging
 from app.utils.delta_ops import DeltaOperations
 
@@ -11,8 +14,14 @@ logger = logging.getLogger(__name__)
 class SQLExecutor:
     """Execute SQL queries using DuckDB with Delta Lake support."""
     
-    def __init__(self):
-        """Initialize DuckDB connection."""
+    def __init__(self, max_cached_bytes: Optional[int] = None):
+        """
+        Initialize DuckDB connection.
+        
+        Args:
+            max_cached_bytes: Memory budget for registered Arrow tables, enforced
+                by evict_tables (None = unbounded)
+        """
         self.conn = duckdb.connect(":memory:")
         # Install and load delta extension
         try:
@@ -20,25 +29,120 @@ class SQLExecutor:
             self.conn.execute("LOAD delta")
             logger.info("DuckDB Delta extension loaded")
         except Exception as e:
-            logger.warning(f"Could not load Delta extension: {e}")
+            logger.warning("Could not load Delta extension: %s", e)
+        # Delta version currently registered for each table name
+        self.registered_versions: Dict[str, Optional[int]] = {}
+        # Size of each registered Arrow table, least recently used first
+        self.max_cached_bytes = max_cached_bytes
+        self._table_bytes: "OrderedDict[str, int]" = OrderedDict()
     
-    def register_delta_table(self, table_name: str, delta_path: str) -> None:
+    def extract_statements(self, query: str) -> List[duckdb.Statement]:
         """
-        Register a Delta table for SQL queries.
+        Parse a SQL string without running it.
         
         Args:
-            table_name: Name to use in SQL queries
-            delta_path: Path to Delta table (gs://...)
+            query: SQL text, possibly holding several statements
+            
+        Returns:
+            Parsed statements in order, with their type and query text
+            
+        Raises:
+            duckdb.ParserException: If the SQL cannot be parsed
         """
-        try:
-            # Read Delta table as pandas DataFrame
-            df = DeltaOperations.read_delta(delta_path)
-            # Register as DuckDB table
-            self.conn.register(table_name, df)
-            logger.info(f"Registered Delta table {table_name} from {delta_path}")
-        except Exception as e:
-            logger.error(f"Failed to register table {table_name}: {e}")
-            raise
+        return self.conn.extract_statements(query)
+    
+    def register_delta_tables(
+        self,
+        tables: List[Tuple[str, str, Optional[int]]],
+        max_workers: int = 8
+    ) -> Dict[str, str]:
+        """
+        Register several Delta tables for SQL queries in one call.
+        
+        Tables are read concurrently as Arrow tables, which DuckDB scans without
+        copying, then registered one after the other on this connection.
+        Registering an already registered name replaces it.
+        
+        Args:
+            tables: (table_name, delta_path, version) for every table to register
+            max_workers: Maximum number of tables read at the same time
+            
+        Returns:
+            Error message for each table that could not be registered
+        """
+        errors: Dict[str, str] = {}
+        if not tables:
+            return errors
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(tables))) as pool:
+            futures = {
+                table_name: pool.submit(DeltaOperations.read_delta_arrow, delta_path)
+                for table_name, delta_path, _ in tables
+            }
+        
+        for table_name, delta_path, version in tables:
+            try:
+                arrow_table = futures[table_name].result()
+                self.conn.register(table_name, arrow_table)
+                self.registered_versions[table_name] = version
+                self._table_bytes[table_name] = arrow_table.nbytes
+                self._table_bytes.move_to_end(table_name)
+                logger.debug("Registered Delta table %s from %s", table_name, delta_path)
+            except Exception as e:
+                logger.error("Failed to register table %s: %s", table_name, e)
+                errors[table_name] = str(e)
+        
+        return errors
+    
+    def is_registered(self, table_name: str, version: Optional[int]) -> bool:
+        """
+        Check whether a table is already registered at the given Delta version.
+        
+        Args:
+            table_name: Name used in SQL queries
+            version: Expected Delta version
+            
+        Returns:
+            True if the registered data is up to date
+        """
+        up_to_date = (
+            version is not None
+            and table_name in self.registered_versions
+            and self.registered_versions[table_name] == version
+        )
+        if up_to_date and table_name in self._table_bytes:
+            self._table_bytes.move_to_end(table_name)
+        return up_to_date
+    
+    def evict_tables(self, keep: Iterable[str] = ()) -> List[str]:
+        """
+        Unregister least recently used Arrow tables until the memory budget is met.
+        
+        Args:
+            keep: Tables that must stay registered (e.g. those of the running query)
+            
+        Returns:
+            Names of the unregistered tables
+        """
+        if self.max_cached_bytes is None:
+            return []
+        
+        keep = set(keep)
+        total = sum(self._table_bytes.values())
+        evicted = []
+        for table_name in list(self._table_bytes):
+            if total <= self.max_cached_bytes:
+                break
+            if table_name in keep:
+                continue
+            self.conn.unregister(table_name)
+            total -= self._table_bytes.pop(table_name)
+            self.registered_versions.pop(table_name, None)
+            evicted.append(table_name)
+        
+        if evicted:
+            logger.debug("Evicted %s registered tables: %s", len(evicted), evicted)
+        return evicted
     
     def execute_query(self, query: str) -> pd.DataFrame:
         """
@@ -50,11 +154,42 @@ class SQLExecutor:
         Returns:
             Query results as pandas DataFrame
         """
-        logger.info(f"Executing SQL query")
-        logger.debug(f"Query: {query}")
+        logger.debug("Executing SQL query")
+        logger.debug("Query: %s", query)
         
         result = self.conn.execute(query).fetchdf()
-        logger.info(f"Query returned {len(result)} rows")
+        logger.debug("Query returned %s rows", len(result))
+        return result
+    
+    def execute_query_arrow(self, query: str, max_rows: Optional[int] = None) -> pa.Table:
+        """
+        Execute a SQL query and return results as an Arrow table.
+        
+        Args:
+            query: SQL query to execute
+            max_rows: Stop fetching once this many rows were produced (None = all rows)
+            
+        Returns:
+            Query results as a pyarrow Table
+        """
+        logger.debug("Executing SQL query (arrow)")
+        logger.debug("Query: %s", query)
+        
+        if max_rows is None:
+            result = self.conn.execute(query).arrow()
+        else:
+            # Pull record batches lazily so DuckDB stops producing rows early
+            reader = self.conn.execute(query).fetch_record_batch(rows_per_batch=max(1, min(max_rows, 100_000)))
+            batches = []
+            fetched = 0
+            for batch in reader:
+                batches.append(batch)
+                fetched += batch.num_rows
+                if fetched >= max_rows:
+                    break
+            result = pa.Table.from_batches(batches, schema=reader.schema).slice(0, max_rows)
+        
+        logger.debug("Query returned %s rows", result.num_rows)
         return result
     
     def execute_merge(
@@ -0,0 +1,133 @@
+"""Pool of long-lived SQL executors for the query API."""
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.config import get_settings
+from app.utils.sql_executor import SQLExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class SQLExecutorPool:
+    """
+    Fixed-size pool of SQLExecutor instances.
+    
+    Each executor owns its own DuckDB connection and keeps its registered
+    tables between requests, so re-acquiring an executor skips registration
+    of tables whose Delta version has not changed. An executor is only used
+    by one request at a time, which keeps DuckDB connections single-threaded.
+    Executors are created lazily, up to `size`. Callers must only run read-only
+    statements, and each executor evicts its least recently used tables beyond
+    `max_cached_bytes`.
+    """
+    
+    def __init__(self, size: int, max_cached_bytes: Optional[int] = None):
+        """
+        Initialize the pool.
+        
+        Args:
+            size: Maximum number of executors
+            max_cached_bytes: Registered-table memory budget of each executor
+        """
+        self.size = max(1, size)
+        self.max_cached_bytes = max_cached_bytes
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._executors: List[SQLExecutor] = []
+        self._create_lock = asyncio.Lock()
+        # Thread work running on each acquired executor, by id(executor)
+        self._in_flight: Dict[int, asyncio.Future] = {}
+    
+    async def acquire(self) -> SQLExecutor:
+        """
+        Take an executor from the pool, waiting if all of them are in use.
+        
+        Returns:
+            SQLExecutor reserved for the caller until release()
+        """
+        if self._idle.empty():
+            async with self._create_lock:
+                if self._idle.empty() and len(self._executors) < self.size:
+                    executor = await asyncio.to_thread(SQLExecutor, self.max_cached_bytes)
+                    self._executors.append(executor)
+                    logger.info("Created SQL executor %s/%s", len(self._executors), self.size)
+                    return executor
+        return await self._idle.get()
+    
+    async def run(self, executor: SQLExecutor, func: Callable[..., Any], *args) -> Any:
+        """
+        Run blocking work on an acquired executor in a worker thread.
+        
+        The thread keeps running if the caller is cancelled (client disconnect,
+        shutdown); release() then waits for it before the executor is reused,
+        so a DuckDB connection is never used by two threads at once.
+        
+        Args:
+            executor: Executor obtained from acquire()
+            func: Blocking callable using the executor
+            args: Positional arguments for func
+            
+        Returns:
+            Result of func
+        """
+        future = asyncio.ensure_future(asyncio.to_thread(func, *args))
+        self._in_flight[id(executor)] = future
+        return await asyncio.shield(future)
+    
+    def release(self, executor: SQLExecutor) -> None:
+        """
+        Return an executor to the pool.
+        
+        If the caller was cancelled while thread work started by run() is still
+        using the executor, it is returned once that work has finished.
+        
+        Args:
+            executor: Executor obtained from acquire()
+        """
+        future = self._in_flight.pop(id(executor), None)
+        if future is not None and not future.done():
+            logger.debug("Deferring SQL executor release until its running query finishes")
+            future.add_done_callback(lambda done: self._release_after(done, executor))
+            return
+        self._idle.put_nowait(executor)
+    
+    def _release_after(self, future: asyncio.Future, executor: SQLExecutor) -> None:
+        """Return an executor once abandoned thread work has finished."""
+        if not future.cancelled() and future.exception() is not None:
+            logger.debug("Abandoned SQL executor work failed: %s", future.exception())
+        self._idle.put_nowait(executor)
+    
+    def close(self) -> None:
+        """Close every executor created by the pool."""
+        for executor in self._executors:
+            try:
+                executor.close()
+            except Exception as e:
+                logger.warning("Error closing SQL executor: %s", e)
+        logger.info("Closed %s SQL executors", len(self._executors))
+        self._executors = []
+        self._idle = asyncio.Queue()
+
+
+# Global pool instance
+_pool: Optional[SQLExecutorPool] = None
+
+
+def get_sql_executor_pool() -> SQLExecutorPool:
+    """Get or create the SQL executor pool."""
+    global _pool
+    if _pool is None:
+        settings = get_settings()
+        _pool = SQLExecutorPool(
+            settings.sql_executor_pool_size,
+            max_cached_bytes=settings.sql_executor_max_cached_mb * 1024 * 1024
+        )
+    return _pool
+
+
+def close_sql_executor_pool() -> None:
+    """Close the SQL executor pool, if one was created (called on app shutdown)."""
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
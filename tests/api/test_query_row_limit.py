@@ -0,0 +1,47 @@
+"""Tests for the row limit pushed into /query statements."""
+import duckdb
+import pytest
+from app.api.routes.data import _with_row_limit
+
+
+class TestWithRowLimit:
+    """_with_row_limit must keep every valid single SELECT runnable."""
+    
+    @classmethod
+    def setup_class(cls):
+        """Open an in-memory DuckDB connection for all tests."""
+        cls.conn = duckdb.connect(":memory:")
+    
+    def _run_limited(self, sql: str, limit: int = 2):
+        """Wrap sql with the row limit and return the rows it produces."""
+        statements = self.conn.extract_statements(sql)
+        limited_sql = _with_row_limit(sql, limit, statements)
+        return self.conn.execute(limited_sql).fetchall()
+    
+    @pytest.mark.parametrize("sql", [
+        "SELECT 1;",
+        "SELECT 1; -- note",
+        "SELECT 1 -- note",
+        "SELECT 1 ; ; /* note */",
+    ])
+    def test_trailing_terminator_and_comments(self, sql):
+        """Test that trailing ';' and comments do not break the subquery."""
+        assert self._run_limited(sql) == [(1,)]
+    
+    def test_semicolon_inside_string_is_kept(self):
+        """Test that only real terminators are removed."""
+        assert self._run_limited("SELECT 'a;b' AS v; -- note") == [("a;b",)]
+    
+    def test_limit_requests_one_extra_row(self):
+        """Test that one row past the limit is fetched to detect truncation."""
+        assert len(self._run_limited("SELECT * FROM range(10);", limit=3)) == 4
+    
+    def test_multi_statement_is_unchanged(self):
+        """Test that multi-statement input is not wrapped."""
+        sql = "SELECT 1; SELECT 2"
+        assert _with_row_limit(sql, 2, self.conn.extract_statements(sql)) == sql
+    
+    @classmethod
+    def teardown_class(cls):
+        """Close the DuckDB connection."""
+        cls.conn.close()